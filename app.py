@@ -1,65 +1,158 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from functools import lru_cache
-from datetime import date
-import json
-import pandas as pd
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from collections import OrderedDict
+import asyncio
+import functools
+import hashlib
+import time
+import msgpack
+import orjson
+import numpy as np
 from finance_clean.compute import compute_all
-from finance_clean.normalize import sanitize_for_json
 
-app = FastAPI(title="Financial Metrics API", version="1.0.0")
-app.add_middleware(CORSMiddleware,allow_origins=["http://localhost:3000","http://127.0.0.1:3000","*"],allow_credentials=True,allow_methods=["*"],allow_headers=["*"])
+def _orjson_default(obj):
+    """Fallback encoder for values orjson does not serialize natively (numpy scalars, Decimal, Timestamp)."""
+    if isinstance(obj, np.floating):
+        return None if obj != obj else float(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
 
-@lru_cache(maxsize=256)
-def _cached_metrics(ticker:str,salt:str)->dict:
-    return compute_all(ticker)
+def _dumps(content) -> bytes:
+    return orjson.dumps(content, default=_orjson_default,
+                        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS)
+
+class AppJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        return _dumps(content)
+
+app = FastAPI(title="Financial Metrics API", version="1.0.0", default_response_class=AppJSONResponse)
+# Explicit origins (a "*" wildcard is not valid together with credentials); the API is read-only, so GET only,
+# and browsers may cache preflight results for a day
+app.add_middleware(CORSMiddleware,allow_origins=["http://localhost:3000","http://127.0.0.1:3000"],allow_credentials=True,allow_methods=["GET"],allow_headers=["*"],max_age=86400)
+app.add_middleware(GZipMiddleware,minimum_size=512,compresslevel=5)
+
+# Per-ticker TTL cache capped at CACHE_MAX_ENTRIES: concurrent misses for the same key await one shared
+# in-flight fetch instead of each hitting yfinance
+CACHE_TTL=86400
+CACHE_MAX_ENTRIES=1024
+CACHE:OrderedDict[str,tuple[float,dict]]=OrderedDict()
+INFLIGHT:dict[str,asyncio.Task]={}
+
+def _evict(cache:OrderedDict,now:float)->None:
+    # Every entry gets the same TTL and moves to the end when stored, so the front is both the soonest
+    # to expire and the least recently stored: pop expired entries, then the oldest down to the cap
+    while cache:
+        expiry,_=next(iter(cache.values()))
+        if expiry>now and len(cache)<=CACHE_MAX_ENTRIES:break
+        cache.popitem(last=False)
+
+async def _load(cache:OrderedDict,key:str,loader):
+    value=await run_in_threadpool(loader,key)
+    now=time.time()
+    cache[key]=(now+CACHE_TTL,value)
+    cache.move_to_end(key)
+    _evict(cache,now)
+    return value
+
+async def _ttl_cached(cache:OrderedDict,inflight:dict,key:str,loader,force_refresh:bool=False):
+    entry=cache.get(key)
+    if not force_refresh and entry and entry[0]>time.time():return entry[1]
+    task=inflight.get(key)
+    if task is None:
+        task=inflight[key]=asyncio.ensure_future(_load(cache,key,loader))
+        task.add_done_callback(lambda _:inflight.pop(key,None))
+    # shield: a disconnecting client must not cancel the fetch other requests are waiting on
+    return await asyncio.shield(task)
+
+def _cache_key(ticker:str)->str:
+    # One canonical key per symbol, so " aapl" and "AAPL" share a cache entry and an in-flight fetch
+    return ticker.strip().upper()
+
+def _etag_matches(if_none_match:str,etag:str)->bool:
+    # If-None-Match is a comma-separated list (or "*") compared weakly: W/ prefixes are ignored,
+    # but each entry must equal the whole tag
+    opaque=etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag=tag.strip()
+        if tag=="*" or (tag and tag.removeprefix("W/")==opaque):return True
+    return False
+
+async def _cached_metrics(ticker:str,force_refresh:bool=False)->dict:
+    return await _ttl_cached(CACHE,INFLIGHT,ticker,functools.partial(compute_all,include_alpha=True),force_refresh)
 
 @app.get("/health")
 def health():
     return {"ok":True}
 
+BATCH_LIMIT=10
+
+# Declared before /metrics/{ticker} so "batch" is not captured as a ticker symbol
+@app.get("/metrics/batch")
+async def metrics_batch(tickers:str):
+    try:
+        # Fan out through the TTL cache: fetches overlap, and duplicates share one in-flight computation
+        symbols=list(dict.fromkeys(_cache_key(t) for t in tickers.split(",") if t.strip()))[:BATCH_LIMIT]
+        results=await asyncio.gather(*[_cached_metrics(t) for t in symbols],return_exceptions=True)
+        return {t:(r if not isinstance(r,Exception) else {"error":str(r)}) for t,r in zip(symbols,results)}
+    except Exception as e:
+        raise HTTPException(status_code=400,detail=str(e))
+
 @app.get("/metrics/{ticker}")
-def metrics(ticker:str,force_refresh:bool=False):
+async def metrics(ticker:str,request:Request,force_refresh:bool=False):
     try:
-        salt="" if force_refresh else str(date.today())
-        res=_cached_metrics(ticker.upper(),salt)
+        t=_cache_key(ticker)
+        res=await _cached_metrics(t,force_refresh)
         if not res or "ratios" not in res:raise HTTPException(status_code=502,detail="Computation failed")
-        return res
+        # Clients and CDNs may reuse the payload until the cache entry expires; revalidation is a hash compare
+        body=_dumps(res)
+        # Weak validator: GZipMiddleware may re-encode the bytes, so the tag only vouches for the JSON content
+        etag='W/"'+hashlib.blake2b(body,digest_size=8).hexdigest()+'"'
+        max_age=max(0,int(CACHE[t][0]-time.time())) if t in CACHE else 0
+        headers={"ETag":etag,"Cache-Control":f"public, max-age={max_age}"}
+        if _etag_matches(request.headers.get("if-none-match",""),etag):return Response(status_code=304,headers=headers)
+        return Response(content=body,media_type="application/json",headers=headers)
     except Exception as e:
         raise HTTPException(status_code=400,detail=str(e))
 
 @app.get("/metrics/{ticker}/dump")
-def dump(ticker:str):
+async def dump(ticker:str,request:Request):
     try:
-        res=compute_all(ticker.upper())
-        return json.loads(json.dumps(res,default=str))
+        res=await run_in_threadpool(compute_all,ticker.upper(),include_alpha=True)
+        # Programmatic clients can ask for compact binary msgpack instead of JSON
+        if "application/x-msgpack" in request.headers.get("accept",""):
+            return Response(content=msgpack.packb(res,default=_orjson_default,use_bin_type=True),media_type="application/x-msgpack")
+        # Returning the response directly skips FastAPI's jsonable_encoder walk: one orjson pass, straight to bytes
+        return AppJSONResponse(content=res)
     except Exception as e:
         raise HTTPException(status_code=400,detail=str(e))
 
 @app.get("/api/company/summary")
-def company_summary(ticker:str):
+async def company_summary(ticker:str):
     try:
-        res=compute_all(ticker.upper())
-        
-        # Get company info directly from yfinance
-        import yfinance as yf
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        # Profile fields come from the same yfinance payload compute_all fetches, no second round-trip
+        res=await run_in_threadpool(compute_all,ticker.upper(),include_alpha=True,include_profile=True)
+        get = (res.get("profile") or {}).get
         
         response = {
             "ticker": res["ticker"],
             "ticker_normalized": res["ticker"],
             "exists": True,
             "instrument_type": "EQUITY",
-            "company_name": info.get("longName", ticker),
-            "sector": info.get("sector", "N/A"),
-            "industry": info.get("industry", "N/A"),
+            "company_name": get("long_name") or ticker,
+            "sector": get("sector") or "N/A",
+            "industry": get("industry") or "N/A",
             "real_time": {
-                "price": info.get("currentPrice", info.get("regularMarketPrice", 0)),
+                "price": get("price") or 0,
                 "currency": res["currency"],
                 "timestamp": "2024-01-01T00:00:00Z"
             },
-            "beta": info.get("beta", 0),
+            "beta": get("beta") or 0,
             "alpha": res.get("alpha", 0),
             "data_quality": "complete" if not res.get("error") else "error",
             "missing": [],
@@ -69,51 +162,109 @@ def company_summary(ticker:str):
             }
         }
         
-        # Sanitize the response for JSON serialization
-        return sanitize_for_json(response)
+        # orjson writes NaN/inf as null and numpy scalars natively, so no Python-level sanitize walk is needed
+        return AppJSONResponse(content=response)
     except Exception as e:
         raise HTTPException(status_code=400,detail=str(e))
 
-@app.get("/api/metrics/simple")
-def metrics_simple(ticker:str, precision:int=4):
+class _ResponseModel(BaseModel):
+    # Non-finite floats are written as null by the serializer, no Python-level sanitizing pass needed
+    model_config = ConfigDict(ser_json_inf_nan="null")
+
+class AltmanScores(_ResponseModel):
+    z: Optional[float] = None
+    z_prime: Optional[float] = None
+
+class SimpleRatios(_ResponseModel):
+    current: Optional[float] = None
+    quick: Optional[float] = None
+    debt_to_equity: Optional[float] = None
+    roe: Optional[float] = None
+    roe_adjusted: Optional[float] = None
+    roa: Optional[float] = None
+    pe: Optional[float] = None
+    pb: Optional[float] = None
+    ps: Optional[float] = None
+    peg: Optional[float] = None
+    dividend_yield: Optional[float] = None
+    dividend_payout_ratio: Optional[float] = None
+    dividend_coverage_ratio: Optional[float] = None
+
+class PiotroskiSummary(_ResponseModel):
+    score: Optional[int] = None
+    fscore_display: str = "N/A"
+    signals: dict[str, int] = {}
+
+class SimpleMetrics(_ResponseModel):
+    beneish_m_score: Optional[float] = None
+    beneish_reason: Optional[str] = None
+    beneish_components: dict[str, Optional[float]] = {}
+    altman: AltmanScores
+    ratios: SimpleRatios
+    piotroski: PiotroskiSummary
+    dupont: dict[str, dict[str, Optional[float]]] = {}
+
+class AuditInfo(_ResponseModel):
+    period_used: str
+    ttm_quarters: int
+    statement_alignment: str
+    generated_at: str
+    sources_used: list[str]
+
+class MetricsSimpleResponse(_ResponseModel):
+    ticker: str
+    metrics: SimpleMetrics
+    data_quality: str
+    missing: list[str]
+    audit: AuditInfo
+
+def _round_metric(value, precision:int):
+    # NaN is the only value not equal to itself, so no pandas dispatch is needed per scalar
+    if value is None or value != value:
+        return None
+    return round(float(value), precision)
+
+@app.get("/api/metrics/simple", response_model=MetricsSimpleResponse)
+async def metrics_simple(ticker:str, precision:int=4):
     try:
-        res=compute_all(ticker.upper())
-        
-        # Round ratios to specified precision
-        def round_ratio(value, decimals=precision):
-            if value is None or pd.isna(value):
-                return None
-            return round(float(value), decimals)
+        res=await run_in_threadpool(compute_all,ticker.upper())
+        # Bind each section once instead of re-walking res for every field
+        ratios = res.get("ratios") or {}
+        pb = res.get("price_based") or {}
+        divs = res.get("dividends") or {}
+        beneish = res.get("beneish") or {}
+        altman = res.get("altman") or {}
+        piotroski = res.get("piotroski") or {}
         
         response = {
             "ticker": res["ticker"],
             "metrics": {
-                "beneish_m_score": round_ratio(res.get("beneish", {}).get("m")),
-                "beneish_reason": res.get("beneish", {}).get("reason"),
-                "beneish_components": {k: round_ratio(v) for k, v in res.get("beneish", {}).get("components", {}).items()},
+                "beneish_m_score": _round_metric(beneish.get("m"), precision),
+                "beneish_reason": beneish.get("reason"),
+                "beneish_components": {k: _round_metric(v, precision) for k, v in beneish.get("components", {}).items()},
                 "altman": {
-                    "z": round_ratio(res.get("altman", {}).get("z")),
-                    "z_prime": round_ratio(res.get("altman", {}).get("z_prime"))
+                    "z": _round_metric(altman.get("z"), precision),
+                    "z_prime": _round_metric(altman.get("z_prime"), precision)
                 },
                 "ratios": {
-                    "current": round_ratio(res["ratios"].get("current")),
-                    "quick": round_ratio(res["ratios"].get("quick")),
-                    "debt_to_equity": round_ratio(res["ratios"].get("debt_to_equity")),
-                    "roe": round_ratio(res["ratios"].get("roe")),
-                    "roe_adjusted": round_ratio(res["ratios"].get("roe_adjusted")),
-                    "roa": round_ratio(res["ratios"].get("roa")),
-                    "pe": round_ratio(res["price_based"].get("pe")),
-                    "pb": round_ratio(res["price_based"].get("pb")),
-                    "ps": round_ratio(res["price_based"].get("ps")),
-                    "peg": round_ratio(res["price_based"].get("peg")),
-                    "dividend_yield": round_ratio(res["dividends"].get("dividend_yield")),
-                    "dividend_payout_ratio": round_ratio(res["dividends"].get("dividend_payout_ratio")),
-                    "dividend_coverage_ratio": round_ratio(res["dividends"].get("dividend_coverage_ratio"))
+                    "current": _round_metric(ratios.get("current"), precision),
+                    "quick": _round_metric(ratios.get("quick"), precision),
+                    "debt_to_equity": _round_metric(ratios.get("debt_to_equity"), precision),
+                    "roe": _round_metric(ratios.get("roe"), precision),
+                    "roe_adjusted": _round_metric(ratios.get("roe_adjusted"), precision),
+                    "roa": _round_metric(ratios.get("roa"), precision),
+                    "pe": _round_metric(pb.get("pe"), precision),
+                    "pb": _round_metric(pb.get("pb"), precision),
+                    "ps": _round_metric(pb.get("ps"), precision),
+                    "peg": _round_metric(pb.get("peg"), precision),
+                    "dividend_yield": _round_metric(divs.get("dividend_yield"), precision),
+                    "dividend_payout_ratio": _round_metric(divs.get("dividend_payout_ratio"), precision),
+                    "dividend_coverage_ratio": _round_metric(divs.get("dividend_coverage_ratio"), precision)
                 },
                 "piotroski": {
-                    "score": res.get("piotroski", {}).get("score"),
-                    "fscore_display": res.get("piotroski", {}).get("fscore_display", "N/A"),
-                    "signals": res.get("piotroski", {}).get("signals", {})
+                    "score": piotroski.get("score"),
+                    "fscore_display": piotroski.get("fscore_display", "N/A"),
+                    "signals": piotroski.get("signals", {})
                 },
                 "dupont": res.get("dupont", {})
             },
@@ -128,146 +279,180 @@ def metrics_simple(ticker:str, precision:int=4):
             }
         }
         
-        # Sanitize the response for JSON serialization
-        return sanitize_for_json(response)
+        return response
     except Exception as e:
         raise HTTPException(status_code=400,detail=str(e))
 
+# Comprehensive list of real Yahoo Finance tickers organized by category
+TICKER_DATABASE = {
+    # Technology Giants
+    "AAPL": {"name": "Apple Inc.", "exchange": "NASDAQ", "sector": "Technology"},
+    "MSFT": {"name": "Microsoft Corporation", "exchange": "NASDAQ", "sector": "Technology"},
+    "GOOGL": {"name": "Alphabet Inc. Class A", "exchange": "NASDAQ", "sector": "Technology"},
+    "GOOG": {"name": "Alphabet Inc. Class C", "exchange": "NASDAQ", "sector": "Technology"},
+    "AMZN": {"name": "Amazon.com Inc.", "exchange": "NASDAQ", "sector": "Consumer Discretionary"},
+    "META": {"name": "Meta Platforms Inc.", "exchange": "NASDAQ", "sector": "Technology"},
+    "NVDA": {"name": "NVIDIA Corporation", "exchange": "NASDAQ", "sector": "Technology"},
+    "TSLA": {"name": "Tesla Inc.", "exchange": "NASDAQ", "sector": "Consumer Discretionary"},
+    "NFLX": {"name": "Netflix Inc.", "exchange": "NASDAQ", "sector": "Communication Services"},
+    "ADBE": {"name": "Adobe Inc.", "exchange": "NASDAQ", "sector": "Technology"},
+    "CRM": {"name": "Salesforce Inc.", "exchange": "NYSE", "sector": "Technology"},
+    "INTC": {"name": "Intel Corporation", "exchange": "NASDAQ", "sector": "Technology"},
+    "AMD": {"name": "Advanced Micro Devices Inc.", "exchange": "NASDAQ", "sector": "Technology"},
+    "ORCL": {"name": "Oracle Corporation", "exchange": "NYSE", "sector": "Technology"},
+    "IBM": {"name": "International Business Machines Corporation", "exchange": "NYSE", "sector": "Technology"},
+    "CSCO": {"name": "Cisco Systems Inc.", "exchange": "NASDAQ", "sector": "Technology"},
+    "QCOM": {"name": "QUALCOMM Incorporated", "exchange": "NASDAQ", "sector": "Technology"},
+    "AVGO": {"name": "Broadcom Inc.", "exchange": "NASDAQ", "sector": "Technology"},
+    "TXN": {"name": "Texas Instruments Incorporated", "exchange": "NASDAQ", "sector": "Technology"},
+    "MU": {"name": "Micron Technology Inc.", "exchange": "NASDAQ", "sector": "Technology"},
+    
+    # Financial Services
+    "JPM": {"name": "JPMorgan Chase & Co.", "exchange": "NYSE", "sector": "Financial Services"},
+    "BAC": {"name": "Bank of America Corporation", "exchange": "NYSE", "sector": "Financial Services"},
+    "WFC": {"name": "Wells Fargo & Company", "exchange": "NYSE", "sector": "Financial Services"},
+    "GS": {"name": "Goldman Sachs Group Inc.", "exchange": "NYSE", "sector": "Financial Services"},
+    "MS": {"name": "Morgan Stanley", "exchange": "NYSE", "sector": "Financial Services"},
+    "C": {"name": "Citigroup Inc.", "exchange": "NYSE", "sector": "Financial Services"},
+    "AXP": {"name": "American Express Company", "exchange": "NYSE", "sector": "Financial Services"},
+    "V": {"name": "Visa Inc.", "exchange": "NYSE", "sector": "Financial Services"},
+    "MA": {"name": "Mastercard Incorporated", "exchange": "NYSE", "sector": "Financial Services"},
+    "PYPL": {"name": "PayPal Holdings Inc.", "exchange": "NASDAQ", "sector": "Financial Services"},
+    "SQ": {"name": "Block Inc.", "exchange": "NYSE", "sector": "Financial Services"},
+    "COIN": {"name": "Coinbase Global Inc.", "exchange": "NASDAQ", "sector": "Financial Services"},
+    
+    # Healthcare & Pharmaceuticals
+    "JNJ": {"name": "Johnson & Johnson", "exchange": "NYSE", "sector": "Healthcare"},
+    "PFE": {"name": "Pfizer Inc.", "exchange": "NYSE", "sector": "Healthcare"},
+    "UNH": {"name": "UnitedHealth Group Incorporated", "exchange": "NYSE", "sector": "Healthcare"},
+    "ABBV": {"name": "AbbVie Inc.", "exchange": "NYSE", "sector": "Healthcare"},
+    "MRK": {"name": "Merck & Co. Inc.", "exchange": "NYSE", "sector": "Healthcare"},
+    "TMO": {"name": "Thermo Fisher Scientific Inc.", "exchange": "NYSE", "sector": "Healthcare"},
+    "ABT": {"name": "Abbott Laboratories", "exchange": "NYSE", "sector": "Healthcare"},
+    "DHR": {"name": "Danaher Corporation", "exchange": "NYSE", "sector": "Healthcare"},
+    "BMY": {"name": "Bristol Myers Squibb Company", "exchange": "NYSE", "sector": "Healthcare"},
+    "AMGN": {"name": "Amgen Inc.", "exchange": "NASDAQ", "sector": "Healthcare"},
+    "GILD": {"name": "Gilead Sciences Inc.", "exchange": "NASDAQ", "sector": "Healthcare"},
+    "CVS": {"name": "CVS Health Corporation", "exchange": "NYSE", "sector": "Healthcare"},
+    
+    # Consumer & Retail
+    "WMT": {"name": "Walmart Inc.", "exchange": "NYSE", "sector": "Consumer Staples"},
+    "PG": {"name": "Procter & Gamble Company", "exchange": "NYSE", "sector": "Consumer Staples"},
+    "KO": {"name": "The Coca-Cola Company", "exchange": "NYSE", "sector": "Consumer Staples"},
+    "PEP": {"name": "PepsiCo Inc.", "exchange": "NASDAQ", "sector": "Consumer Staples"},
+    "MCD": {"name": "McDonald's Corporation", "exchange": "NYSE", "sector": "Consumer Discretionary"},
+    "SBUX": {"name": "Starbucks Corporation", "exchange": "NASDAQ", "sector": "Consumer Discretionary"},
+    "NKE": {"name": "NIKE Inc.", "exchange": "NYSE", "sector": "Consumer Discretionary"},
+    "HD": {"name": "The Home Depot Inc.", "exchange": "NYSE", "sector": "Consumer Discretionary"},
+    "LOW": {"name": "Lowe's Companies Inc.", "exchange": "NYSE", "sector": "Consumer Discretionary"},
+    "TGT": {"name": "Target Corporation", "exchange": "NYSE", "sector": "Consumer Discretionary"},
+    "COST": {"name": "Costco Wholesale Corporation", "exchange": "NASDAQ", "sector": "Consumer Staples"},
+    
+    # Energy & Utilities
+    "XOM": {"name": "Exxon Mobil Corporation", "exchange": "NYSE", "sector": "Energy"},
+    "CVX": {"name": "Chevron Corporation", "exchange": "NYSE", "sector": "Energy"},
+    "COP": {"name": "ConocoPhillips", "exchange": "NYSE", "sector": "Energy"},
+    "EOG": {"name": "EOG Resources Inc.", "exchange": "NYSE", "sector": "Energy"},
+    "SLB": {"name": "Schlumberger Limited", "exchange": "NYSE", "sector": "Energy"},
+    "NEE": {"name": "NextEra Energy Inc.", "exchange": "NYSE", "sector": "Utilities"},
+    "DUK": {"name": "Duke Energy Corporation", "exchange": "NYSE", "sector": "Utilities"},
+    "SO": {"name": "The Southern Company", "exchange": "NYSE", "sector": "Utilities"},
+    
+    # Industrial & Materials
+    "BA": {"name": "The Boeing Company", "exchange": "NYSE", "sector": "Industrials"},
+    "CAT": {"name": "Caterpillar Inc.", "exchange": "NYSE", "sector": "Industrials"},
+    "GE": {"name": "General Electric Company", "exchange": "NYSE", "sector": "Industrials"},
+    "HON": {"name": "Honeywell International Inc.", "exchange": "NASDAQ", "sector": "Industrials"},
+    "MMM": {"name": "3M Company", "exchange": "NYSE", "sector": "Industrials"},
+    "UPS": {"name": "United Parcel Service Inc.", "exchange": "NYSE", "sector": "Industrials"},
+    "FDX": {"name": "FedEx Corporation", "exchange": "NYSE", "sector": "Industrials"},
+    
+    # Communication Services
+    "DIS": {"name": "The Walt Disney Company", "exchange": "NYSE", "sector": "Communication Services"},
+    "CMCSA": {"name": "Comcast Corporation", "exchange": "NASDAQ", "sector": "Communication Services"},
+    "VZ": {"name": "Verizon Communications Inc.", "exchange": "NYSE", "sector": "Communication Services"},
+    "T": {"name": "AT&T Inc.", "exchange": "NYSE", "sector": "Communication Services"},
+    "TMUS": {"name": "T-Mobile US Inc.", "exchange": "NASDAQ", "sector": "Communication Services"},
+    
+    # Real Estate
+    "AMT": {"name": "American Tower Corporation", "exchange": "NYSE", "sector": "Real Estate"},
+    "PLD": {"name": "Prologis Inc.", "exchange": "NYSE", "sector": "Real Estate"},
+    "CCI": {"name": "Crown Castle Inc.", "exchange": "NYSE", "sector": "Real Estate"},
+    
+    # Berkshire Hathaway
+    "BRK-B": {"name": "Berkshire Hathaway Inc. Class B", "exchange": "NYSE", "sector": "Financial Services"},
+    "BRK-A": {"name": "Berkshire Hathaway Inc. Class A", "exchange": "NYSE", "sector": "Financial Services"},
+    
+    # ETFs
+    "SPY": {"name": "SPDR S&P 500 ETF Trust", "exchange": "NYSE", "sector": "ETF"},
+    "QQQ": {"name": "Invesco QQQ Trust", "exchange": "NASDAQ", "sector": "ETF"},
+    "VTI": {"name": "Vanguard Total Stock Market Index Fund", "exchange": "NYSE", "sector": "ETF"},
+    "VOO": {"name": "Vanguard S&P 500 ETF", "exchange": "NYSE", "sector": "ETF"},
+    "IWM": {"name": "iShares Russell 2000 ETF", "exchange": "NYSE", "sector": "ETF"},
+}
+
+# Upper-cased company names, computed once for case-insensitive name matching
+_UPPER_NAME_INDEX = {symbol: info["name"].upper() for symbol, info in TICKER_DATABASE.items()}
+_TICKER_ORDER = {symbol: i for i, symbol in enumerate(TICKER_DATABASE)}
+
+# Inverted index of every 1..3-gram in each symbol and name -> symbols containing it.
+# Short queries are a single lookup; longer ones intersect their trigrams and verify the survivors.
+_NGRAM = 3
+
+def _build_ngram_index()->dict:
+    index: dict[str, set[str]] = {}
+    for symbol in TICKER_DATABASE:
+        for text in (symbol, _UPPER_NAME_INDEX[symbol]):
+            for n in range(1, _NGRAM + 1):
+                for i in range(len(text) - n + 1):
+                    index.setdefault(text[i:i + n], set()).add(symbol)
+    return index
+
+_NGRAM_INDEX = _build_ngram_index()
+
+def _search_candidates(query_upper:str)->list:
+    """Symbols that may contain the query in their symbol or name, in database order."""
+    if not query_upper:
+        return list(TICKER_DATABASE)
+    if len(query_upper) <= _NGRAM:
+        candidates = _NGRAM_INDEX.get(query_upper, ())
+    else:
+        grams = {query_upper[i:i + _NGRAM] for i in range(len(query_upper) - _NGRAM + 1)}
+        candidates = set.intersection(*(_NGRAM_INDEX.get(g, set()) for g in grams))
+    return sorted(candidates, key=_TICKER_ORDER.__getitem__)
+
+def _search_result(symbol:str, info:dict)->dict:
+    return {
+        "symbol": symbol,
+        "company_name": info["name"],
+        "exchange": info["exchange"],
+        "display": f"{symbol} - {info['name']} ({info['exchange']})"
+    }
+
 @app.get("/api/search")
 def search_tickers(query:str):
     try:
-        # Comprehensive list of real Yahoo Finance tickers organized by category
-        ticker_database = {
-            # Technology Giants
-            "AAPL": {"name": "Apple Inc.", "exchange": "NASDAQ", "sector": "Technology"},
-            "MSFT": {"name": "Microsoft Corporation", "exchange": "NASDAQ", "sector": "Technology"},
-            "GOOGL": {"name": "Alphabet Inc. Class A", "exchange": "NASDAQ", "sector": "Technology"},
-            "GOOG": {"name": "Alphabet Inc. Class C", "exchange": "NASDAQ", "sector": "Technology"},
-            "AMZN": {"name": "Amazon.com Inc.", "exchange": "NASDAQ", "sector": "Consumer Discretionary"},
-            "META": {"name": "Meta Platforms Inc.", "exchange": "NASDAQ", "sector": "Technology"},
-            "NVDA": {"name": "NVIDIA Corporation", "exchange": "NASDAQ", "sector": "Technology"},
-            "TSLA": {"name": "Tesla Inc.", "exchange": "NASDAQ", "sector": "Consumer Discretionary"},
-            "NFLX": {"name": "Netflix Inc.", "exchange": "NASDAQ", "sector": "Communication Services"},
-            "ADBE": {"name": "Adobe Inc.", "exchange": "NASDAQ", "sector": "Technology"},
-            "CRM": {"name": "Salesforce Inc.", "exchange": "NYSE", "sector": "Technology"},
-            "INTC": {"name": "Intel Corporation", "exchange": "NASDAQ", "sector": "Technology"},
-            "AMD": {"name": "Advanced Micro Devices Inc.", "exchange": "NASDAQ", "sector": "Technology"},
-            "ORCL": {"name": "Oracle Corporation", "exchange": "NYSE", "sector": "Technology"},
-            "IBM": {"name": "International Business Machines Corporation", "exchange": "NYSE", "sector": "Technology"},
-            "CSCO": {"name": "Cisco Systems Inc.", "exchange": "NASDAQ", "sector": "Technology"},
-            "QCOM": {"name": "QUALCOMM Incorporated", "exchange": "NASDAQ", "sector": "Technology"},
-            "AVGO": {"name": "Broadcom Inc.", "exchange": "NASDAQ", "sector": "Technology"},
-            "TXN": {"name": "Texas Instruments Incorporated", "exchange": "NASDAQ", "sector": "Technology"},
-            "MU": {"name": "Micron Technology Inc.", "exchange": "NASDAQ", "sector": "Technology"},
-            
-            # Financial Services
-            "JPM": {"name": "JPMorgan Chase & Co.", "exchange": "NYSE", "sector": "Financial Services"},
-            "BAC": {"name": "Bank of America Corporation", "exchange": "NYSE", "sector": "Financial Services"},
-            "WFC": {"name": "Wells Fargo & Company", "exchange": "NYSE", "sector": "Financial Services"},
-            "GS": {"name": "Goldman Sachs Group Inc.", "exchange": "NYSE", "sector": "Financial Services"},
-            "MS": {"name": "Morgan Stanley", "exchange": "NYSE", "sector": "Financial Services"},
-            "C": {"name": "Citigroup Inc.", "exchange": "NYSE", "sector": "Financial Services"},
-            "AXP": {"name": "American Express Company", "exchange": "NYSE", "sector": "Financial Services"},
-            "V": {"name": "Visa Inc.", "exchange": "NYSE", "sector": "Financial Services"},
-            "MA": {"name": "Mastercard Incorporated", "exchange": "NYSE", "sector": "Financial Services"},
-            "PYPL": {"name": "PayPal Holdings Inc.", "exchange": "NASDAQ", "sector": "Financial Services"},
-            "SQ": {"name": "Block Inc.", "exchange": "NYSE", "sector": "Financial Services"},
-            "COIN": {"name": "Coinbase Global Inc.", "exchange": "NASDAQ", "sector": "Financial Services"},
-            
-            # Healthcare & Pharmaceuticals
-            "JNJ": {"name": "Johnson & Johnson", "exchange": "NYSE", "sector": "Healthcare"},
-            "PFE": {"name": "Pfizer Inc.", "exchange": "NYSE", "sector": "Healthcare"},
-            "UNH": {"name": "UnitedHealth Group Incorporated", "exchange": "NYSE", "sector": "Healthcare"},
-            "ABBV": {"name": "AbbVie Inc.", "exchange": "NYSE", "sector": "Healthcare"},
-            "MRK": {"name": "Merck & Co. Inc.", "exchange": "NYSE", "sector": "Healthcare"},
-            "TMO": {"name": "Thermo Fisher Scientific Inc.", "exchange": "NYSE", "sector": "Healthcare"},
-            "ABT": {"name": "Abbott Laboratories", "exchange": "NYSE", "sector": "Healthcare"},
-            "DHR": {"name": "Danaher Corporation", "exchange": "NYSE", "sector": "Healthcare"},
-            "BMY": {"name": "Bristol Myers Squibb Company", "exchange": "NYSE", "sector": "Healthcare"},
-            "AMGN": {"name": "Amgen Inc.", "exchange": "NASDAQ", "sector": "Healthcare"},
-            "GILD": {"name": "Gilead Sciences Inc.", "exchange": "NASDAQ", "sector": "Healthcare"},
-            "CVS": {"name": "CVS Health Corporation", "exchange": "NYSE", "sector": "Healthcare"},
-            
-            # Consumer & Retail
-            "WMT": {"name": "Walmart Inc.", "exchange": "NYSE", "sector": "Consumer Staples"},
-            "PG": {"name": "Procter & Gamble Company", "exchange": "NYSE", "sector": "Consumer Staples"},
-            "KO": {"name": "The Coca-Cola Company", "exchange": "NYSE", "sector": "Consumer Staples"},
-            "PEP": {"name": "PepsiCo Inc.", "exchange": "NASDAQ", "sector": "Consumer Staples"},
-            "MCD": {"name": "McDonald's Corporation", "exchange": "NYSE", "sector": "Consumer Discretionary"},
-            "SBUX": {"name": "Starbucks Corporation", "exchange": "NASDAQ", "sector": "Consumer Discretionary"},
-            "NKE": {"name": "NIKE Inc.", "exchange": "NYSE", "sector": "Consumer Discretionary"},
-            "HD": {"name": "The Home Depot Inc.", "exchange": "NYSE", "sector": "Consumer Discretionary"},
-            "LOW": {"name": "Lowe's Companies Inc.", "exchange": "NYSE", "sector": "Consumer Discretionary"},
-            "TGT": {"name": "Target Corporation", "exchange": "NYSE", "sector": "Consumer Discretionary"},
-            "COST": {"name": "Costco Wholesale Corporation", "exchange": "NASDAQ", "sector": "Consumer Staples"},
-            
-            # Energy & Utilities
-            "XOM": {"name": "Exxon Mobil Corporation", "exchange": "NYSE", "sector": "Energy"},
-            "CVX": {"name": "Chevron Corporation", "exchange": "NYSE", "sector": "Energy"},
-            "COP": {"name": "ConocoPhillips", "exchange": "NYSE", "sector": "Energy"},
-            "EOG": {"name": "EOG Resources Inc.", "exchange": "NYSE", "sector": "Energy"},
-            "SLB": {"name": "Schlumberger Limited", "exchange": "NYSE", "sector": "Energy"},
-            "NEE": {"name": "NextEra Energy Inc.", "exchange": "NYSE", "sector": "Utilities"},
-            "DUK": {"name": "Duke Energy Corporation", "exchange": "NYSE", "sector": "Utilities"},
-            "SO": {"name": "The Southern Company", "exchange": "NYSE", "sector": "Utilities"},
-            
-            # Industrial & Materials
-            "BA": {"name": "The Boeing Company", "exchange": "NYSE", "sector": "Industrials"},
-            "CAT": {"name": "Caterpillar Inc.", "exchange": "NYSE", "sector": "Industrials"},
-            "GE": {"name": "General Electric Company", "exchange": "NYSE", "sector": "Industrials"},
-            "HON": {"name": "Honeywell International Inc.", "exchange": "NASDAQ", "sector": "Industrials"},
-            "MMM": {"name": "3M Company", "exchange": "NYSE", "sector": "Industrials"},
-            "UPS": {"name": "United Parcel Service Inc.", "exchange": "NYSE", "sector": "Industrials"},
-            "FDX": {"name": "FedEx Corporation", "exchange": "NYSE", "sector": "Industrials"},
-            
-            # Communication Services
-            "DIS": {"name": "The Walt Disney Company", "exchange": "NYSE", "sector": "Communication Services"},
-            "CMCSA": {"name": "Comcast Corporation", "exchange": "NASDAQ", "sector": "Communication Services"},
-            "VZ": {"name": "Verizon Communications Inc.", "exchange": "NYSE", "sector": "Communication Services"},
-            "T": {"name": "AT&T Inc.", "exchange": "NYSE", "sector": "Communication Services"},
-            "TMUS": {"name": "T-Mobile US Inc.", "exchange": "NASDAQ", "sector": "Communication Services"},
-            
-            # Real Estate
-            "AMT": {"name": "American Tower Corporation", "exchange": "NYSE", "sector": "Real Estate"},
-            "PLD": {"name": "Prologis Inc.", "exchange": "NYSE", "sector": "Real Estate"},
-            "CCI": {"name": "Crown Castle Inc.", "exchange": "NYSE", "sector": "Real Estate"},
-            
-            # Berkshire Hathaway
-            "BRK-B": {"name": "Berkshire Hathaway Inc. Class B", "exchange": "NYSE", "sector": "Financial Services"},
-            "BRK-A": {"name": "Berkshire Hathaway Inc. Class A", "exchange": "NYSE", "sector": "Financial Services"},
-            
-            # ETFs
-            "SPY": {"name": "SPDR S&P 500 ETF Trust", "exchange": "NYSE", "sector": "ETF"},
-            "QQQ": {"name": "Invesco QQQ Trust", "exchange": "NASDAQ", "sector": "ETF"},
-            "VTI": {"name": "Vanguard Total Stock Market Index Fund", "exchange": "NYSE", "sector": "ETF"},
-            "VOO": {"name": "Vanguard S&P 500 ETF", "exchange": "NYSE", "sector": "ETF"},
-            "IWM": {"name": "iShares Russell 2000 ETF", "exchange": "NYSE", "sector": "ETF"},
-        }
-        
         query_upper = query.upper()
+        candidates = _search_candidates(query_upper)
         results = []
+        seen = set()
         
         # Search by ticker symbol first (exact match gets priority)
-        for symbol, info in ticker_database.items():
-            if query_upper in symbol.upper():
-                results.append({
-                    "symbol": symbol,
-                    "company_name": info["name"],
-                    "exchange": info["exchange"],
-                    "display": f"{symbol} - {info['name']} ({info['exchange']})"
-                })
+        for symbol in candidates:
+            if query_upper in symbol:
+                results.append(_search_result(symbol, TICKER_DATABASE[symbol]))
+                seen.add(symbol)
+                if len(results) >= 15:  # Limit to 15 results
+                    return results
         
         # Then search by company name
-        for symbol, info in ticker_database.items():
-            if query_upper in info["name"].upper() and symbol not in [r["symbol"] for r in results]:
-                results.append({
-                    "symbol": symbol,
-                    "company_name": info["name"],
-                    "exchange": info["exchange"],
-                    "display": f"{symbol} - {info['name']} ({info['exchange']})"
-                })
+        for symbol in candidates:
+            if symbol not in seen and query_upper in _UPPER_NAME_INDEX[symbol]:
+                results.append(_search_result(symbol, TICKER_DATABASE[symbol]))
+                if len(results) >= 15:
+                    break
         
-        return results[:15]  # Limit to 15 results
+        return results
     except Exception as e:
         raise HTTPException(status_code=400,detail=str(e))
 
@@ -290,6 +475,7 @@ def download_historical_data(ticker:str, start:str, end:str, interval:str="1d",
 
 # Run commands
 # uvicorn app:app --reload --host 127.0.0.1 --port 8000
+# uvicorn app:app --host 0.0.0.0 --port 8000 --workers $((2*$(nproc)+1))   # production: one event loop per worker
 # curl -s http://127.0.0.1:8000/health
 # curl -s http://127.0.0.1:8000/metrics/AAPL | jq .
 # fetch("http://127.0.0.1:8000/metrics/MSFT").then(r=>r.json())
\ No newline at end of file
@@ -6,8 +6,8 @@ A clean, modular approach to financial analysis using yfinance data.
 __version__ = "1.0.0"
 __author__ = "Senior Python Engineer"
 
-from .compute import compute_all
-from .fetch import get_financials
+from .compute import compute_all, compute_all_batch, compute_alpha_batch
+from .fetch import get_financials, get_financials_batch
 from .validate import check_accounting_equation
 
-__all__ = ["compute_all", "get_financials", "check_accounting_equation"]
+__all__ = ["compute_all", "compute_all_batch", "compute_alpha_batch", "get_financials", "get_financials_batch", "check_accounting_equation"]
@@ -0,0 +1,102 @@
+"""
+On-disk TTL cache for yfinance responses.
+"""
+
+import os
+import pickle
+import re
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+
+# Default time-to-live values in seconds
+STATEMENT_TTL = 7 * 24 * 3600   # annual statements change at most a few times a year
+INTRADAY_TTL = 24 * 3600        # quote info and price history
+
+# Cache keys become path components, so only plain ticker symbols (BRK.B, ^GSPC, EURUSD=X)
+# and endpoint names are accepted; anything else is never read from or written to disk
+_SAFE_TICKER = re.compile(r"[A-Z0-9.^=-]+")
+_SAFE_ENDPOINT = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+class FileCache:
+    """
+    Pickle-per-entry cache stored as <root>/<ticker>/<endpoint>.pkl.
+
+    Each file holds {"ts": epoch_seconds, "data": obj}. Entries older than the
+    requested TTL, unreadable files, and files written by an incompatible library
+    version are treated as misses and refetched.
+    """
+
+    def __init__(self, root: str = ".cache"):
+        self.root = root
+
+    def _path(self, ticker: str, endpoint: str) -> str:
+        """
+        Path for (ticker, endpoint); raises ValueError for keys that could escape the cache root.
+        """
+        safe_ticker = ticker.upper()
+        if (not _SAFE_TICKER.fullmatch(safe_ticker) or not _SAFE_ENDPOINT.fullmatch(endpoint)
+                or set(safe_ticker) == {"."} or set(endpoint) == {"."}):
+            raise ValueError(f"Unsafe cache key: {ticker!r}, {endpoint!r}")
+        path = os.path.join(self.root, safe_ticker, f"{endpoint}.pkl")
+        root = os.path.realpath(self.root)
+        if os.path.commonpath([root, os.path.realpath(path)]) != root:
+            raise ValueError(f"Cache path escapes {self.root!r}: {path!r}")
+        return path
+
+    def get(self, ticker: str, endpoint: str, ttl: float) -> Optional[Any]:
+        """
+        Return cached data for (ticker, endpoint), or None if missing, older than ttl seconds, or the key is unsafe.
+        """
+        try:
+            with open(self._path(ticker, endpoint), "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+        if time.time() - entry.get("ts", 0) > ttl:
+            return None
+        return entry.get("data")
+
+    def set(self, ticker: str, endpoint: str, data: Any) -> None:
+        """
+        Store data for (ticker, endpoint). The write is atomic so concurrent readers never see a partial file.
+        """
+        tmp_path = None
+        try:
+            path = self._path(ticker, endpoint)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({"ts": time.time(), "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            # A read-only or full disk (or an unsafe key) should only cost us the cache, never the request
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_or_fetch(self, ticker: str, endpoint: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """
+        Return cached data if fresh, otherwise call fetch() and cache its non-empty result.
+        """
+        data = self.get(ticker, endpoint, ttl)
+        if data is None:
+            data = fetch()
+            if not _is_empty(data):
+                self.set(ticker, endpoint, data)
+        return data
+
+
+def _is_empty(data: Any) -> bool:
+    if data is None:
+        return True
+    if hasattr(data, "empty"):
+        return bool(data.empty)
+    if isinstance(data, dict):
+        return not data
+    return False
+
+
+# Shared cache used by the fetch layer; FINANCE_CLEAN_CACHE_DIR overrides the location
+FILE_CACHE = FileCache(os.environ.get("FINANCE_CLEAN_CACHE_DIR", ".cache"))
@@ -2,14 +2,24 @@
 Command-line interface for finance_clean module.
 """
 
-import json
+import orjson
 import argparse
+import math
 import sys
-import pandas as pd
-import numpy as np
 from .compute import compute_all
 
 
+def _label(key: str) -> str:
+    return f"{key.replace('_', ' ').title():<25}"
+
+
+# Row labels and number formats for the table output, built once instead of per row
+_RATIO_LABELS = {k: _label(k) for k in ("current", "quick", "debt_to_equity", "roe", "roa", "roe_adjusted")}
+_RATIO_FMT = {"roe": "{:.2%}", "roa": "{:.2%}", "roe_adjusted": "{:.2%}"}
+_DIVIDEND_LABELS = {k: _label(k) for k in ("dividend_yield", "dividend_payout_ratio", "dividend_coverage_ratio")}
+_DIVIDEND_FMT = {"dividend_yield": "{:.2%}", "dividend_payout_ratio": "{:.2%}"}
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -59,7 +69,8 @@ Examples:
     
     try:
         # Compute financial metrics
-        result = compute_all(args.ticker)
+        # Alpha needs two extra price-history fetches and is only part of the full output
+        result = compute_all(args.ticker, include_alpha=args.dump or args.verbose)
         
         # Check for errors
         if "error" in result:
@@ -97,10 +108,10 @@ Examples:
         
         if args.format == "json":
             # Sort keys for deterministic output
+            option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
             if args.dump:
-                print(json.dumps(output, indent=2, default=str, sort_keys=True))
-            else:
-                print(json.dumps(output, indent=2, default=str))
+                option |= orjson.OPT_SORT_KEYS
+            print(orjson.dumps(output, default=str, option=option).decode())
         else:
             # Table format
             print_table_output(output)
@@ -112,111 +123,111 @@ Examples:
 
 def print_table_output(data):
     """Print output in a formatted table."""
-    print(f"\n{'='*60}")
-    print(f"FINANCIAL ANALYSIS: {data['ticker']}")
-    print(f"{'='*60}")
+    # Collect rows and write them in one call instead of one print (and stdout lock) per row
+    lines = []
+    lines.append(f"\n{'='*60}")
+    lines.append(f"FINANCIAL ANALYSIS: {data['ticker']}")
+    lines.append(f"{'='*60}")
     
-    print(f"\nCurrency: {data['currency']}")
+    lines.append(f"\nCurrency: {data['currency']}")
     if 'years' in data and len(data['years']) >= 2:
-        print(f"Years: {data['years'][0]} - {data['years'][1]}")
+        lines.append(f"Years: {data['years'][0]} - {data['years'][1]}")
     
     if 'ratios' in data:
-        print(f"\n{'FINANCIAL RATIOS':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'FINANCIAL RATIOS':<30}")
+        lines.append(f"{'-'*30}")
         for ratio, value in data['ratios'].items():
-            if isinstance(value, (int, float)) and not pd.isna(value):
-                if 'roe' in ratio or 'roa' in ratio:
-                    print(f"{ratio.replace('_', ' ').title():<25}: {value:.2%}")
-                else:
-                    print(f"{ratio.replace('_', ' ').title():<25}: {value:.4f}")
+            label = _RATIO_LABELS.get(ratio) or _label(ratio)
+            if isinstance(value, (int, float)) and not math.isnan(value):
+                lines.append(f"{label}: {_RATIO_FMT.get(ratio, '{:.4f}').format(value)}")
             else:
-                print(f"{ratio.replace('_', ' ').title():<25}: N/A")
+                lines.append(f"{label}: N/A")
     
     if 'dupont' in data:
-        print(f"\n{'DUPONT ANALYSIS':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'DUPONT ANALYSIS':<30}")
+        lines.append(f"{'-'*30}")
         if 'roe_3step' in data['dupont']:
             roe3 = data['dupont']['roe_3step']
-            print(f"3-Step ROE: {roe3.get('roe', 0):.2%}")
-            print(f"  Net Profit Margin: {roe3.get('npm', 0):.2%}")
-            print(f"  Asset Turnover: {roe3.get('asset_turnover', 0):.4f}")
-            print(f"  Equity Multiplier: {roe3.get('equity_multiplier', 0):.4f}")
+            lines.append(f"3-Step ROE: {roe3.get('roe', 0):.2%}")
+            lines.append(f"  Net Profit Margin: {roe3.get('npm', 0):.2%}")
+            lines.append(f"  Asset Turnover: {roe3.get('asset_turnover', 0):.4f}")
+            lines.append(f"  Equity Multiplier: {roe3.get('equity_multiplier', 0):.4f}")
         if 'roe_5step' in data['dupont']:
             roe5 = data['dupont']['roe_5step']
-            print(f"5-Step ROE: {roe5.get('roe', 0):.2%}")
+            lines.append(f"5-Step ROE: {roe5.get('roe', 0):.2%}")
     
     if 'piotroski' in data:
-        print(f"\n{'PIOTROSKI F-SCORE':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'PIOTROSKI F-SCORE':<30}")
+        lines.append(f"{'-'*30}")
         piotroski = data['piotroski']
         if 'fscore_display' in piotroski:
-            print(f"F-Score: {piotroski['fscore_display']}")
+            lines.append(f"F-Score: {piotroski['fscore_display']}")
         else:
-            score = piotroski.get('score', np.nan)
-            if not pd.isna(score):
-                print(f"F-Score: {score:.2f}/9")
+            score = piotroski.get('score')
+            if score is not None and not math.isnan(score):
+                lines.append(f"F-Score: {score:.2f}/9")
             else:
-                print("F-Score: N/A")
+                lines.append("F-Score: N/A")
         
         signals = piotroski.get('signals', {})
         for signal, value in signals.items():
-            print(f"  {signal}: {'✓' if value == 1 else '✗'}")
+            lines.append(f"  {signal}: {'✓' if value == 1 else '✗'}")
     
     if 'beneish' in data:
-        print(f"\n{'BENEISH M-SCORE':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'BENEISH M-SCORE':<30}")
+        lines.append(f"{'-'*30}")
         beneish = data['beneish']
         if beneish.get('m') is not None:
-            print(f"M-Score: {beneish['m']:.4f}")
+            lines.append(f"M-Score: {beneish['m']:.4f}")
         else:
-            print(f"M-Score: N/A ({beneish.get('reason', 'Unknown reason')})")
+            lines.append(f"M-Score: N/A ({beneish.get('reason', 'Unknown reason')})")
         
         components = beneish.get('components', {})
         for comp, value in components.items():
             if value is not None:
-                print(f"  {comp}: {value:.4f}")
+                lines.append(f"  {comp}: {value:.4f}")
             else:
-                print(f"  {comp}: N/A")
+                lines.append(f"  {comp}: N/A")
     
     if 'price_based' in data:
-        print(f"\n{'PRICE-BASED RATIOS':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'PRICE-BASED RATIOS':<30}")
+        lines.append(f"{'-'*30}")
         for ratio, value in data['price_based'].items():
             if value is not None:
-                print(f"{ratio.upper():<25}: {value:.4f}")
+                lines.append(f"{ratio.upper():<25}: {value:.4f}")
             else:
-                print(f"{ratio.upper():<25}: N/A")
+                lines.append(f"{ratio.upper():<25}: N/A")
     
     if 'dividends' in data:
-        print(f"\n{'DIVIDEND METRICS':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'DIVIDEND METRICS':<30}")
+        lines.append(f"{'-'*30}")
         for metric, value in data['dividends'].items():
+            label = _DIVIDEND_LABELS.get(metric) or _label(metric)
             if value is not None:
-                if 'yield' in metric or 'payout' in metric:
-                    print(f"{metric.replace('_', ' ').title():<25}: {value:.2%}")
-                else:
-                    print(f"{metric.replace('_', ' ').title():<25}: {value:.4f}")
+                lines.append(f"{label}: {_DIVIDEND_FMT.get(metric, '{:.4f}').format(value)}")
             else:
-                print(f"{metric.replace('_', ' ').title():<25}: N/A")
+                lines.append(f"{label}: N/A")
     
     if 'validation' in data:
-        print(f"\n{'ACCOUNTING VALIDATION':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'ACCOUNTING VALIDATION':<30}")
+        lines.append(f"{'-'*30}")
         for year, validation in data['validation'].items():
             status = "✓ PASS" if validation.get('ok', False) else "✗ FAIL"
             delta = validation.get('delta', 'N/A')
             if isinstance(delta, (int, float)):
-                print(f"{year}: {status} (delta: {delta:.4f})")
+                lines.append(f"{year}: {status} (delta: {delta:.4f})")
             else:
-                print(f"{year}: {status} (delta: {delta})")
+                lines.append(f"{year}: {status} (delta: {delta})")
     
     if 'notes' in data and data['notes']:
-        print(f"\n{'NOTES':<30}")
-        print(f"{'-'*30}")
+        lines.append(f"\n{'NOTES':<30}")
+        lines.append(f"{'-'*30}")
         for note in data['notes']:
-            print(f"• {note}")
+            lines.append(f"• {note}")
+    
+    lines.append(f"\n{'='*60}")
     
-    print(f"\n{'='*60}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -2,15 +2,367 @@
 Core financial metric computation module with explicit formulas.
 """
 
+import copy
+import functools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from types import MappingProxyType
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List
-import yfinance as yf
-from .fetch import get_financials
-from .normalize import select_two_years, safe_get_field, safe_div, avg
+from .fetch import (get_financials, get_financials_batch, get_history, get_info,
+                    download_history_bulk, download_info)
+from .normalize import (select_two_years, avg, pct_change, njit, NUMBA_AVAILABLE,
+                        INCOME_FIELDS, BALANCE_FIELDS, CASHFLOW_FIELDS, STATEMENT_FIELDS)
 from .validate import check_accounting_equation, collect_missing
 
 
+# Fields whose absence is reported in notes; PretaxIncome only feeds the 5-step DuPont
+# tax/interest burden terms, so it is optional
+NEEDED_FIELDS = {
+    'income': tuple(f for f in INCOME_FIELDS if f != 'PretaxIncome'),
+    'balance': BALANCE_FIELDS,
+    'cashflow': CASHFLOW_FIELDS,
+}
+
+# Kernel input layout: one float64 vector per year holding these fields in order
+KERNEL_FIELDS = INCOME_FIELDS + BALANCE_FIELDS + CASHFLOW_FIELDS
+(_REVENUE, _GROSS_PROFIT, _OPERATING_INCOME, _NET_INCOME, _PRETAX_INCOME, _SGA, _TAX_EXPENSE, _INTEREST_EXPENSE,
+ _ASSETS, _LIABILITIES, _EQUITY, _CURRENT_ASSETS, _CURRENT_LIABILITIES, _INVENTORY, _NET_PPE,
+ _RETAINED_EARNINGS, _RECEIVABLES,
+ _CFO, _DEPRECIATION, _DIVIDENDS_PAID) = range(len(KERNEL_FIELDS))
+_BALANCE_START = len(INCOME_FIELDS)
+_CASHFLOW_START = _BALANCE_START + len(BALANCE_FIELDS)
+
+# Kernel output layout: every metric as float64 in this order (NaN = not computable);
+# piotroski_mask packs signal Fk into bit k-1
+PIOTROSKI_SIGNALS = ('F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9')
+BENEISH_COMPONENTS = ('DSRI', 'GMI', 'AQI', 'SGI', 'DEPI', 'SGAI', 'LVGI', 'TATA')
+ALTMAN_COMPONENTS = ('a', 'b', 'c', 'd', 'e')
+METRIC_OUTPUTS = (
+    ('current', 'quick', 'debt_to_equity', 'roe', 'roa',
+     'npm', 'asset_turnover', 'equity_multiplier', 'roe_3step',
+     'tax_burden', 'interest_burden', 'operating_margin', 'roe_5step',
+     'pe', 'pb', 'ps', 'peg',
+     'dividend_yield', 'dividend_payout_ratio', 'dividend_coverage_ratio')
+    + ('piotroski_mask',)
+    + BENEISH_COMPONENTS + ('beneish_m',)
+    + tuple(f'altman_{k}' for k in ALTMAN_COMPONENTS) + ('altman_z',)
+)
+
+
+@njit(cache=True)
+def _kdiv(numerator, denominator):
+    """
+    safe_div for the kernel: NaN on NaN inputs, a ~0 denominator, or an infinite result.
+    """
+    if math.isnan(numerator) or math.isnan(denominator) or abs(denominator) < 1e-12:
+        return np.nan
+    result = numerator / denominator
+    if math.isinf(result):
+        return np.nan
+    return result
+
+
+@njit(cache=True)
+def _positive(value):
+    """
+    Return value if it is > 0, else NaN (gates per-share and growth divisions).
+    """
+    return value if value > 0 else np.nan
+
+
+@njit(cache=True)
+def _compute_metrics_kernel(vals_t, vals_t1, shares, price, dividend_rate, book_value):
+    """
+    Pure-arithmetic core of compute_all, jitted when numba is installed.
+    
+    Args:
+        vals_t: float64 array of KERNEL_FIELDS for the most recent year
+        vals_t1: float64 array of KERNEL_FIELDS for the prior year
+        shares: Shares outstanding (NaN if unknown)
+        price: Current share price (NaN if unknown)
+        dividend_rate: Annual dividend per share from info (NaN if unknown)
+        book_value: Book value per share from info, used when shares is unusable
+        
+    Returns:
+        float64 array of metrics in METRIC_OUTPUTS order; NaN marks a metric that could not be computed
+    """
+    revenue_t, revenue_t1 = vals_t[_REVENUE], vals_t1[_REVENUE]
+    gross_profit_t, gross_profit_t1 = vals_t[_GROSS_PROFIT], vals_t1[_GROSS_PROFIT]
+    operating_income_t = vals_t[_OPERATING_INCOME]
+    net_income_t, net_income_t1 = vals_t[_NET_INCOME], vals_t1[_NET_INCOME]
+    pretax_income_t = vals_t[_PRETAX_INCOME]
+    sga_t, sga_t1 = vals_t[_SGA], vals_t1[_SGA]
+    assets_t, assets_t1 = vals_t[_ASSETS], vals_t1[_ASSETS]
+    liabilities_t, liabilities_t1 = vals_t[_LIABILITIES], vals_t1[_LIABILITIES]
+    equity_t, equity_t1 = vals_t[_EQUITY], vals_t1[_EQUITY]
+    current_assets_t, current_assets_t1 = vals_t[_CURRENT_ASSETS], vals_t1[_CURRENT_ASSETS]
+    current_liabilities_t, current_liabilities_t1 = vals_t[_CURRENT_LIABILITIES], vals_t1[_CURRENT_LIABILITIES]
+    inventory_t = vals_t[_INVENTORY]
+    net_ppe_t, net_ppe_t1 = vals_t[_NET_PPE], vals_t1[_NET_PPE]
+    retained_earnings_t = vals_t[_RETAINED_EARNINGS]
+    receivables_t, receivables_t1 = vals_t[_RECEIVABLES], vals_t1[_RECEIVABLES]
+    cfo_t = vals_t[_CFO]
+    depreciation_t, depreciation_t1 = vals_t[_DEPRECIATION], vals_t1[_DEPRECIATION]
+    dividends_paid_t = vals_t[_DIVIDENDS_PAID]
+    
+    # Averages for ROE/ROA (NaN if either year is missing)
+    avg_assets = (assets_t + assets_t1) / 2.0
+    avg_equity = (equity_t + equity_t1) / 2.0
+    
+    # Year-end ratios shared by Piotroski, Beneish and Altman, computed once
+    roa_t = _kdiv(net_income_t, assets_t)
+    roa_t1 = _kdiv(net_income_t1, assets_t1)
+    leverage_t = _kdiv(liabilities_t, assets_t)
+    leverage_t1 = _kdiv(liabilities_t1, assets_t1)
+    gross_margin_t = _kdiv(gross_profit_t, revenue_t)
+    gross_margin_t1 = _kdiv(gross_profit_t1, revenue_t1)
+    turnover_t = _kdiv(revenue_t, assets_t)
+    turnover_t1 = _kdiv(revenue_t1, assets_t1)
+    current_ratio_t1 = _kdiv(current_assets_t1, current_liabilities_t1)
+    
+    # Core ratios
+    current_ratio = _kdiv(current_assets_t, current_liabilities_t)
+    quick_ratio = _kdiv(current_assets_t - inventory_t, current_liabilities_t)
+    debt_to_equity = _kdiv(liabilities_t, equity_t)
+    roe = _kdiv(net_income_t, avg_equity)
+    roa = _kdiv(net_income_t, avg_assets)
+    
+    # DuPont Analysis (3-step and 5-step)
+    npm = _kdiv(net_income_t, revenue_t)
+    asset_turnover = _kdiv(revenue_t, avg_assets)
+    equity_multiplier = _kdiv(assets_t, equity_t)
+    roe_dupont_3 = npm * asset_turnover * equity_multiplier
+    tax_burden = _kdiv(net_income_t, pretax_income_t)
+    interest_burden = _kdiv(pretax_income_t, operating_income_t)
+    operating_margin = _kdiv(operating_income_t, revenue_t)
+    roe_dupont_5 = tax_burden * interest_burden * operating_margin * asset_turnover * equity_multiplier
+    
+    # Price-based ratios
+    per_share = _positive(shares)
+    eps_t = _kdiv(net_income_t, per_share)
+    eps_t1 = _kdiv(net_income_t1, per_share)
+    bps_t = book_value if math.isnan(per_share) else _kdiv(equity_t, per_share)
+    sps_t = _kdiv(revenue_t, per_share)
+    growth_eps = _kdiv(eps_t - eps_t1, _positive(eps_t1))
+    pe = _kdiv(price, eps_t)
+    pb = _kdiv(price, bps_t)
+    ps = _kdiv(price, sps_t)
+    peg = _kdiv(pe, 100 * _positive(growth_eps))
+    
+    # Dividend metrics
+    div_ps = dividend_rate if not math.isnan(dividend_rate) else _kdiv(-dividends_paid_t, per_share)
+    dividend_yield = _kdiv(div_ps, price)
+    dividend_payout_ratio = _kdiv(div_ps, _positive(eps_t))
+    dividend_coverage_ratio = _kdiv(eps_t, _positive(div_ps))
+    
+    # Piotroski F-Score (0-9, two-year signals); comparisons against NaN are false
+    # Signal Fk is bit k-1 of the mask (branchless: each comparison becomes a 0/1 int)
+    piotroski_mask = (
+        int(roa_t > 0)
+        | (int(cfo_t > 0) << 1)
+        | (int(roa_t > roa_t1) << 2)
+        | (int(cfo_t > net_income_t) << 3)
+        | (int(leverage_t < leverage_t1) << 4)
+        | (int(current_ratio > current_ratio_t1) << 5)
+        | (int(shares <= shares) << 6)  # Simplified: assume no share dilution
+        | (int(gross_margin_t > gross_margin_t1) << 7)
+        | (int(turnover_t > turnover_t1) << 8)
+    )
+    
+    # Beneish components and M-Score (NaN propagates if any component is missing)
+    dsri = _kdiv(_kdiv(receivables_t, revenue_t), _kdiv(receivables_t1, revenue_t1))
+    gmi = _kdiv(gross_margin_t1, gross_margin_t)
+    aqi = _kdiv(1 - _kdiv(current_assets_t + net_ppe_t, assets_t), 1 - _kdiv(current_assets_t1 + net_ppe_t1, assets_t1))
+    sgi = _kdiv(revenue_t, revenue_t1)
+    depi = _kdiv(_kdiv(depreciation_t1, depreciation_t1 + net_ppe_t1), _kdiv(depreciation_t, depreciation_t + net_ppe_t))
+    sgai = _kdiv(_kdiv(sga_t, revenue_t), _kdiv(sga_t1, revenue_t1))
+    lvgi = _kdiv(leverage_t, leverage_t1)
+    tata = _kdiv(operating_income_t - cfo_t, assets_t)
+    beneish_m = -4.84 + 0.92*dsri + 0.528*gmi + 0.404*aqi + 0.892*sgi + 0.115*depi - 0.172*sgai + 4.679*tata - 0.327*lvgi
+    
+    # Altman Z-Score: Z = 1.2A + 1.4B + 3.3C + 0.6D + 1.0E
+    # A = Working Capital / Total Assets
+    # B = Retained Earnings / Total Assets
+    # C = EBIT (Operating Income) / Total Assets
+    # D = Equity / Total Liabilities (book value as proxy for market value)
+    # E = Sales / Total Assets
+    altman_a = _kdiv(current_assets_t - current_liabilities_t, assets_t)
+    altman_b = _kdiv(retained_earnings_t, assets_t)
+    altman_c = _kdiv(operating_income_t, assets_t)
+    altman_d = _kdiv(equity_t, liabilities_t)
+    altman_e = turnover_t
+    altman_z = 1.2*altman_a + 1.4*altman_b + 3.3*altman_c + 0.6*altman_d + 1.0*altman_e
+    
+    return np.array([
+        current_ratio, quick_ratio, debt_to_equity, roe, roa,
+        npm, asset_turnover, equity_multiplier, roe_dupont_3,
+        tax_burden, interest_burden, operating_margin, roe_dupont_5,
+        pe, pb, ps, peg,
+        dividend_yield, dividend_payout_ratio, dividend_coverage_ratio,
+        piotroski_mask,
+        dsri, gmi, aqi, sgi, depi, sgai, lvgi, tata, beneish_m,
+        altman_a, altman_b, altman_c, altman_d, altman_e, altman_z,
+    ])
+
+
+@njit(cache=True)
+def _alpha_kernel(stock_returns, spy_returns, beta):
+    """
+    Annualized CAPM alpha from aligned monthly returns (risk-free rate assumed 0).
+    
+    Args:
+        stock_returns: float64 array of monthly stock returns
+        spy_returns: float64 array of SPY returns for the same months
+        beta: Stock beta
+        
+    Returns:
+        12 * (mean(stock) - beta * mean(SPY)), or NaN with fewer than 12 months of data
+    """
+    if stock_returns.shape[0] < 12:  # Need at least 1 year of data
+        return np.nan
+    # alpha = R_stock - (Rf + beta * (R_market - Rf)), annualized
+    return (stock_returns.mean() - beta * spy_returns.mean()) * 12.0
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from the on-disk cache) at import so the first request doesn't pay for it
+    try:
+        _compute_metrics_kernel(np.ones(len(KERNEL_FIELDS)), np.ones(len(KERNEL_FIELDS)), 1.0, 1.0, 1.0, 1.0)
+        _alpha_kernel(np.zeros(12), np.zeros(12), 1.0)
+    except Exception:
+        pass
+
+
+def _rnd(value, precision: int = 4):
+    """
+    Round a scalar metric, mapping None/NaN to None (NaN is the only value unequal to itself).
+    """
+    if value is None or value != value:
+        return None
+    return round(float(value), precision)
+
+
+# Shape of compute_all's result when computation fails; _error_result fills in the per-call fields
+_ERROR_TEMPLATE = MappingProxyType({
+    "ticker": None,
+    "error": None,
+    "currency": "Unknown",
+    "years": [],
+    "validation": {},
+    "ratios": {},
+    "dupont": {},
+    "piotroski": {"score": None, "fscore_display": "N/A", "signals": {}},
+    "beneish": {"m": None, "reason": None, "components": {}},
+    "altman": {"z": None, "z_prime": None, "reason": None, "components": {}},
+    "price_based": {},
+    "dividends": {},
+    "alpha": None,
+    "notes": []
+})
+
+
+def _error_result(ticker: str, message: str) -> Dict[str, Any]:
+    """
+    Build compute_all's error payload from _ERROR_TEMPLATE.
+    """
+    result = copy.deepcopy(dict(_ERROR_TEMPLATE))
+    result["ticker"] = ticker
+    result["error"] = message
+    result["beneish"]["reason"] = f"computation_error: {message}"
+    result["altman"]["reason"] = f"computation_error: {message}"
+    result["notes"].append(f"Error: {message}")
+    return result
+
+
+def _as_float(value) -> float:
+    """
+    Coerce an info payload value to float, mapping None and non-numeric values to NaN.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _profile(info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Company profile fields (name, sector, industry, beta, price) from an info payload.
+    """
+    price = _as_float(info.get('currentPrice') or info.get('regularMarketPrice'))
+    return {
+        "long_name": info.get("longName"),
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "beta": info.get("beta"),
+        "price": None if price != price else price
+    }
+
+
+def _error_profile(ticker: str, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Profile for an error result, or None when no info payload is available.
+    
+    ETFs and new listings fail the metrics but still have an info payload: it comes from
+    raw_data when the statements were fetched, else from get_info (normally a disk-cache
+    hit, since get_financials caches info before it rejects empty statements).
+    """
+    try:
+        return _profile(raw_data["info"] if raw_data is not None else get_info(ticker))
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def _spy_monthly_returns(month_bucket: str) -> pd.Series:
+    """
+    SPY monthly returns over the last 3 years, memoized per process for one calendar month.
+    
+    Args:
+        month_bucket: UTC "YYYY-MM" the result is valid for (only used as the cache key)
+        
+    Returns:
+        Monthly close-to-close returns; raises if no history is available so a failed
+        fetch is not memoized
+    """
+    spy_data = get_history("SPY", period="3y", interval="1mo")
+    if spy_data.empty:
+        raise ValueError("no SPY history available")
+    return spy_data['Close'].pct_change().dropna()
+
+
+def _naive_index(series: pd.Series) -> pd.Series:
+    """
+    The series with its DatetimeIndex stripped of any timezone, keeping local dates.
+    """
+    if getattr(series.index, "tz", None) is None:
+        return series
+    return series.tz_localize(None)
+
+
+def _alpha_from_history(stock_data: pd.DataFrame, beta: float) -> float:
+    """
+    Annualized alpha of a monthly price history against the memoized SPY returns, or None.
+    """
+    if stock_data is None or stock_data.empty:
+        return None
+    
+    # Calculate monthly returns; the SPY benchmark is shared by every ticker
+    stock_returns = stock_data['Close'].pct_change().dropna()
+    spy_returns = _spy_monthly_returns(datetime.now(timezone.utc).strftime("%Y-%m"))
+    
+    # Align dates with one inner join on wall-clock dates (a tz-naive and a tz-aware index
+    # never match); column 0 = stock, column 1 = SPY
+    aligned = pd.concat([_naive_index(stock_returns), _naive_index(spy_returns)],
+                        axis=1, join='inner').to_numpy(dtype=np.float64)
+    
+    alpha_annual = _alpha_kernel(np.ascontiguousarray(aligned[:, 0]), np.ascontiguousarray(aligned[:, 1]), float(beta))
+    return None if math.isnan(alpha_annual) else alpha_annual
+
+
 def calculate_alpha(ticker: str, beta: float = None) -> float:
     """
     Calculate alpha using CAPM model against SPY benchmark.
@@ -23,66 +375,157 @@ def calculate_alpha(ticker: str, beta: float = None) -> float:
         Annualized alpha or None if calculation fails
     """
     try:
-        # Get stock and SPY data for 3 years
-        stock = yf.Ticker(ticker)
-        spy = yf.Ticker("SPY")
+        # Get 3 years of monthly data for the stock (cached on disk)
+        stock_data = get_history(ticker, period="3y", interval="1mo")
         
-        # Get 3 years of monthly data
-        stock_data = stock.history(period="3y", interval="1mo")
-        spy_data = spy.history(period="3y", interval="1mo")
-        
-        if stock_data.empty or spy_data.empty:
-            return None
-            
-        # Calculate monthly returns
-        stock_returns = stock_data['Close'].pct_change().dropna()
-        spy_returns = spy_data['Close'].pct_change().dropna()
-        
-        # Align dates
-        common_dates = stock_returns.index.intersection(spy_returns.index)
-        if len(common_dates) < 12:  # Need at least 1 year of data
+        if stock_data.empty:
             return None
-            
-        stock_returns = stock_returns.loc[common_dates]
-        spy_returns = spy_returns.loc[common_dates]
         
         # Get beta if not provided
         if beta is None:
-            beta = stock.info.get('beta', 1.0)
-            if beta is None or pd.isna(beta):
+            beta = _as_float(get_info(ticker).get('beta'))
+            if beta != beta:
                 beta = 1.0
         
-        # Calculate alpha using CAPM: alpha = R_stock - (Rf + beta * (R_market - Rf))
-        # Assuming risk-free rate is 0 for simplicity
-        alpha_monthly = stock_returns.mean() - beta * spy_returns.mean()
-        
-        # Annualize alpha
-        alpha_annual = alpha_monthly * 12
-        
-        return float(alpha_annual) if not pd.isna(alpha_annual) else None
+        return _alpha_from_history(stock_data, beta)
         
     except Exception:
         return None
 
 
+def calculate_alpha_batch(tickers: List[str], betas: Dict[str, float] = None) -> Dict[str, Any]:
+    """
+    Calculate alpha for many tickers, downloading their histories in bulk (20 symbols per request).
+    
+    Args:
+        tickers: Stock ticker symbols
+        betas: Beta per ticker; tickers without a usable beta use 1.0
+        
+    Returns:
+        Dictionary mapping each ticker to its annualized alpha (None if unavailable)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    betas = betas or {}
+    histories = download_history_bulk(tickers, period="3y", interval="1mo")
+    
+    alphas = {}
+    for t in tickers:
+        beta = _as_float(betas.get(t))
+        try:
+            alphas[t] = _alpha_from_history(histories.get(t), 1.0 if beta != beta else beta)
+        except Exception:
+            alphas[t] = None
+    return alphas
+
+
+def compute_alpha_batch(tickers: List[str], threads: int = None) -> Dict[str, Any]:
+    """
+    Calculate CAPM alpha for many tickers, fetching betas concurrently and histories in bulk.
+    
+    Args:
+        tickers: Stock ticker symbols
+        threads: Worker threads for the info fetch (default: one per ticker, capped at 32)
+        
+    Returns:
+        Dictionary mapping each ticker to its annualized alpha (None if unavailable)
+    """
+    infos = download_info(tickers, threads=threads)
+    betas = {t: info.get('beta') for t, info in infos.items()}
+    return calculate_alpha_batch(tickers, betas)
+
+
+def compute_all_batch(tickers: List[str], workers: int = None, threads: int = None, *,
+                      include_alpha: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute metrics for many tickers: fetch concurrently in threads, then compute across processes.
+    
+    Args:
+        tickers: Stock ticker symbols
+        workers: Compute processes (default: os.cpu_count())
+        threads: Fetch threads (default: one per ticker, capped at 32)
+        include_alpha: Passed through to compute_all
+        
+    Returns:
+        Dictionary mapping each ticker to its compute_all result, in input order
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    
+    # Network tier: overlap yfinance latency (and fill the on-disk cache) with threads
+    raw = get_financials_batch(tickers, threads)
+    
+    # CPU tier: each process runs the pure computation on its prefetched payload. Tickers whose
+    # fetch failed are retried in the worker so they still get compute_all's error payload.
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(compute_all, t, include_alpha=include_alpha, raw_data=raw.get(t)): t
+            for t in tickers
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    return {t: results[t] for t in tickers}
 
 
-def compute_all(ticker: str) -> Dict[str, Any]:
+def compute_all(ticker: str, *, include_alpha: bool = False, include_profile: bool = False,
+                raw_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Compute all financial metrics for a given ticker using explicit formulas.
     
+    With FINANCE_CLEAN_MEMOIZE=1 in the environment, successful results for fetched (not
+    raw_data) calls are memoized per process, so repeated calls for a ticker (e.g. across
+    a test session) skip the fetch and computation; each caller gets its own copy.
+    
     Args:
         ticker: Stock ticker symbol
+        include_alpha: Also calculate CAPM alpha, which needs two extra price-history
+            fetches; "alpha" is None when False
+        include_profile: Also return company profile fields (name, sector, industry,
+            beta, price) taken from the info payload already fetched for the metrics;
+            error results carry it too when the info payload is available
+        raw_data: Pre-fetched get_financials() output (e.g. from get_financials_batch);
+            fetched on demand when None
         
     Returns:
         Dictionary with all computed metrics in deterministic order
     """
+    if raw_data is None and os.environ.get("FINANCE_CLEAN_MEMOIZE") == "1":
+        try:
+            return copy.deepcopy(_compute_all_memo(ticker, include_alpha, include_profile))
+        except ValueError as e:
+            result = _error_result(ticker, str(e))
+            if include_profile:
+                result["profile"] = _error_profile(ticker, None)
+            return result
+    return _compute_all(ticker, include_alpha=include_alpha, include_profile=include_profile,
+                        raw_data=raw_data)
+
+
+@functools.lru_cache(maxsize=32)
+def _compute_all_memo(ticker: str, include_alpha: bool, include_profile: bool) -> Dict[str, Any]:
+    """
+    Memoized _compute_all for fetched data; raises on an error payload so failures are not memoized.
+    """
+    result = _compute_all(ticker, include_alpha=include_alpha, include_profile=include_profile)
+    if "error" in result:
+        raise ValueError(result["error"])
+    return result
+
+
+def _compute_all(ticker: str, *, include_alpha: bool = False, include_profile: bool = False,
+                 raw_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Uncached compute_all; see compute_all for the arguments and result.
+    """
     try:
-        # Fetch raw financial data
-        raw_data = get_financials(ticker)
+        # Fetch raw financial data unless the caller already batch-fetched it
+        if raw_data is None:
+            raw_data = get_financials(ticker)
         
         # Select two most recent years with common columns
-        data = select_two_years(raw_data)
+        data = select_two_years(raw_data, fields=STATEMENT_FIELDS)
         
         income = data['income']
         balance = data['balance']
@@ -91,289 +534,140 @@ def compute_all(ticker: str) -> Dict[str, Any]:
         years = data['years']
         currency = data['currency']
         
-        # Get year indices
-        y_t = years[0]  # Most recent year
-        y_t1 = years[1]  # Prior year
-        
         # Initialize notes list for missing fields
         notes = []
         
-        # Extract financial data using explicit field mappings
-        # Income Statement
-        TotalRevenue_t = safe_get_field(income, ['TotalRevenue'], y_t)
-        TotalRevenue_t1 = safe_get_field(income, ['TotalRevenue'], y_t1)
-        GrossProfit_t = safe_get_field(income, ['GrossProfit'], y_t)
-        GrossProfit_t1 = safe_get_field(income, ['GrossProfit'], y_t1)
-        OperatingIncome_t = safe_get_field(income, ['OperatingIncome'], y_t)
-        OperatingIncome_t1 = safe_get_field(income, ['OperatingIncome'], y_t1)
-        NetIncome_t = safe_get_field(income, ['NetIncome'], y_t)
-        NetIncome_t1 = safe_get_field(income, ['NetIncome'], y_t1)
-        PretaxIncome_t = safe_get_field(income, ['PretaxIncome'], y_t)
-        SellingGeneralAdministrative_t = safe_get_field(income, ['SellingGeneralAdministrative'], y_t)
-        SellingGeneralAdministrative_t1 = safe_get_field(income, ['SellingGeneralAdministrative'], y_t1)
-        IncomeTaxExpense_t = safe_get_field(income, ['IncomeTaxExpense'], y_t)
-        InterestExpense_t = safe_get_field(income, ['InterestExpense'], y_t)
-        
-        # Balance Sheet
-        TotalAssets_t = safe_get_field(balance, ['TotalAssets'], y_t)
-        TotalAssets_t1 = safe_get_field(balance, ['TotalAssets'], y_t1)
-        TotalLiabilities_t = safe_get_field(balance, ['TotalLiabilities'], y_t)
-        TotalLiabilities_t1 = safe_get_field(balance, ['TotalLiabilities'], y_t1)
-        TotalStockholderEquity_t = safe_get_field(balance, ['TotalStockholderEquity'], y_t)
-        TotalStockholderEquity_t1 = safe_get_field(balance, ['TotalStockholderEquity'], y_t1)
-        TotalCurrentAssets_t = safe_get_field(balance, ['TotalCurrentAssets'], y_t)
-        TotalCurrentLiabilities_t = safe_get_field(balance, ['TotalCurrentLiabilities'], y_t)
-        Inventory_t = safe_get_field(balance, ['Inventory'], y_t)
-        NetPPE_t = safe_get_field(balance, ['NetPPE'], y_t)
-        NetPPE_t1 = safe_get_field(balance, ['NetPPE'], y_t1)
-        RetainedEarnings_t = safe_get_field(balance, ['RetainedEarnings'], y_t)
-        NetReceivables_t = safe_get_field(balance, ['NetReceivables'], y_t)
-        NetReceivables_t1 = safe_get_field(balance, ['NetReceivables'], y_t1)
-        
-        # Cash Flow
-        TotalCashFromOperatingActivities_t = safe_get_field(cashflow, ['TotalCashFromOperatingActivities'], y_t)
-        TotalCashFromOperatingActivities_t1 = safe_get_field(cashflow, ['TotalCashFromOperatingActivities'], y_t1)
-        Depreciation_t = safe_get_field(cashflow, ['Depreciation'], y_t)
-        Depreciation_t1 = safe_get_field(cashflow, ['Depreciation'], y_t1)
-        CashDividendsPaid_t = safe_get_field(cashflow, ['CashDividendsPaid'], y_t)
+        # Two-year field arrays (rows in *_FIELDS order, columns [t, t1], NaN where missing) are
+        # written transposed into one preallocated buffer, so each year row is a contiguous
+        # vector indexed by KERNEL_FIELDS position
+        vals = np.empty((2, len(KERNEL_FIELDS)), dtype=np.float64)
+        vals[:, :_BALANCE_START] = data['income_arr'].T
+        vals[:, _BALANCE_START:_CASHFLOW_START] = data['balance_arr'].T
+        vals[:, _CASHFLOW_START:] = data['cashflow_arr'].T
+        vals_t, vals_t1 = vals
         
         # Market data from info
-        shares = info.get('sharesOutstanding', np.nan)
-        price = info.get('currentPrice') or info.get('regularMarketPrice', np.nan)
-        dividend_rate = info.get('dividendRate', np.nan)
-        book_value = info.get('bookValue', np.nan)
-        
-        # Calculate averages for ROE/ROA
-        avg_assets = avg(TotalAssets_t, TotalAssets_t1)
-        avg_equity = avg(TotalStockholderEquity_t, TotalStockholderEquity_t1)
-        
-        # Core ratios (explicit formulas)
-        current_ratio = safe_div(TotalCurrentAssets_t, TotalCurrentLiabilities_t)
-        quick_ratio = safe_div(TotalCurrentAssets_t - Inventory_t, TotalCurrentLiabilities_t)
-        debt_to_equity = safe_div(TotalLiabilities_t, TotalStockholderEquity_t)
-        roe = safe_div(NetIncome_t, avg_equity)
-        roa = safe_div(NetIncome_t, avg_assets)
-        
-        # DuPont Analysis
-        npm = safe_div(NetIncome_t, TotalRevenue_t)
-        asset_turnover = safe_div(TotalRevenue_t, avg_assets)
-        equity_multiplier = safe_div(TotalAssets_t, TotalStockholderEquity_t)
-        roe_dupont_3 = npm * asset_turnover * equity_multiplier
-        
-        # 5-step DuPont
-        tax_burden = safe_div(NetIncome_t, PretaxIncome_t) if not pd.isna(PretaxIncome_t) and PretaxIncome_t != 0 else np.nan
-        interest_burden = safe_div(PretaxIncome_t, OperatingIncome_t) if not pd.isna(OperatingIncome_t) and OperatingIncome_t != 0 else np.nan
-        operating_margin = safe_div(OperatingIncome_t, TotalRevenue_t)
-        roe_dupont_5 = tax_burden * interest_burden * operating_margin * asset_turnover * equity_multiplier
-        
-        # ROE Adjusted (always provided when inputs exist)
-        roe_adjusted = roe_dupont_3
-        
-        # Price-based ratios
-        eps_t = safe_div(NetIncome_t, shares) if not pd.isna(shares) and shares > 0 else np.nan
-        eps_t1 = safe_div(NetIncome_t1, shares) if not pd.isna(shares) and shares > 0 else np.nan
-        bps_t = safe_div(TotalStockholderEquity_t, shares) if not pd.isna(shares) and shares > 0 else book_value
-        sps_t = safe_div(TotalRevenue_t, shares) if not pd.isna(shares) and shares > 0 else np.nan
-        growth_eps = safe_div(eps_t - eps_t1, eps_t1) if not pd.isna(eps_t1) and eps_t1 > 0 else np.nan
-        
-        pe = safe_div(price, eps_t)
-        pb = safe_div(price, bps_t)
-        ps = safe_div(price, sps_t)
-        peg = safe_div(pe, 100 * growth_eps) if not pd.isna(pe) and not pd.isna(growth_eps) and growth_eps > 0 else np.nan
-        
-        # Dividend metrics
-        div_ps = dividend_rate if not pd.isna(dividend_rate) else safe_div(-CashDividendsPaid_t, shares) if not pd.isna(CashDividendsPaid_t) and not pd.isna(shares) and shares > 0 else np.nan
-        dividend_yield = safe_div(div_ps, price)
-        dividend_payout_ratio = safe_div(div_ps, eps_t) if not pd.isna(eps_t) and eps_t > 0 else np.nan
-        dividend_coverage_ratio = safe_div(eps_t, div_ps) if not pd.isna(div_ps) and div_ps > 0 else np.nan
-        
-        # Piotroski F-Score (0-9, two-year signals)
-        ROA_t = safe_div(NetIncome_t, TotalAssets_t)
-        ROA_t1 = safe_div(NetIncome_t1, TotalAssets_t1)
-        CFO_t = TotalCashFromOperatingActivities_t
-        
-        # Get prior year values for Piotroski F6
-        TotalCurrentAssets_t1 = safe_get_field(balance, ['TotalCurrentAssets'], y_t1)
-        TotalCurrentLiabilities_t1 = safe_get_field(balance, ['TotalCurrentLiabilities'], y_t1)
-        
-        # Calculate Piotroski signals
-        piotroski_signals = {
-            'F1': 1 if ROA_t > 0 else 0,
-            'F2': 1 if CFO_t > 0 else 0,
-            'F3': 1 if ROA_t > ROA_t1 else 0,
-            'F4': 1 if CFO_t > NetIncome_t else 0,
-            'F5': 1 if safe_div(TotalLiabilities_t, TotalAssets_t) < safe_div(TotalLiabilities_t1, TotalAssets_t1) else 0,
-            'F6': 1 if safe_div(TotalCurrentAssets_t, TotalCurrentLiabilities_t) > safe_div(TotalCurrentAssets_t1, TotalCurrentLiabilities_t1) else 0,
-            'F7': 1 if shares <= shares else 0,  # Simplified: assume no share dilution
-            'F8': 1 if safe_div(GrossProfit_t, TotalRevenue_t) > safe_div(GrossProfit_t1, TotalRevenue_t1) else 0,
-            'F9': 1 if safe_div(TotalRevenue_t, TotalAssets_t) > safe_div(TotalRevenue_t1, TotalAssets_t1) else 0
-        }
-        
-        piotroski_score = sum(piotroski_signals.values())
+        price = _as_float(info.get('currentPrice') or info.get('regularMarketPrice'))
+        
+        # All ratio and score arithmetic happens in the kernel
+        values = _compute_metrics_kernel(
+            vals_t,
+            vals_t1,
+            _as_float(info.get('sharesOutstanding')),
+            price,
+            _as_float(info.get('dividendRate')),
+            _as_float(info.get('bookValue')),
+        )
+        
+        # Round the whole vector once and map NaN to None with a mask instead of per-metric checks
+        metrics = dict(zip(METRIC_OUTPUTS, np.where(np.isnan(values), None, np.round(values, 4)).tolist()))
+        
+        piotroski_mask = int(metrics['piotroski_mask'])
+        piotroski_signals = {k: (piotroski_mask >> i) & 1 for i, k in enumerate(PIOTROSKI_SIGNALS)}
+        piotroski_score = piotroski_mask.bit_count()
         piotroski_fscore_display = f"{piotroski_score:.2f}/9"
         
-        # Beneish components
-        COGS_t = TotalRevenue_t - GrossProfit_t if not pd.isna(TotalRevenue_t) and not pd.isna(GrossProfit_t) else np.nan
-        COGS_t1 = TotalRevenue_t1 - GrossProfit_t1 if not pd.isna(TotalRevenue_t1) and not pd.isna(GrossProfit_t1) else np.nan
-        
-        DSRI = safe_div(safe_div(NetReceivables_t, TotalRevenue_t), safe_div(NetReceivables_t1, TotalRevenue_t1))
-        GMI = safe_div(safe_div(GrossProfit_t1, TotalRevenue_t1), safe_div(GrossProfit_t, TotalRevenue_t))
-        AQI = safe_div(1 - safe_div(TotalCurrentAssets_t + NetPPE_t, TotalAssets_t), 1 - safe_div(safe_get_field(balance, ['TotalCurrentAssets'], y_t1) + NetPPE_t1, TotalAssets_t1))
-        SGI = safe_div(TotalRevenue_t, TotalRevenue_t1)
-        DEPI = safe_div(safe_div(Depreciation_t1, Depreciation_t1 + NetPPE_t1), safe_div(Depreciation_t, Depreciation_t + NetPPE_t))
-        SGAI = safe_div(safe_div(SellingGeneralAdministrative_t, TotalRevenue_t), safe_div(SellingGeneralAdministrative_t1, TotalRevenue_t1))
-        LVGI = safe_div(safe_div(TotalLiabilities_t, TotalAssets_t), safe_div(TotalLiabilities_t1, TotalAssets_t1))
-        TATA = safe_div(OperatingIncome_t - TotalCashFromOperatingActivities_t, TotalAssets_t)
-        
-        # Beneish M-Score calculation
-        beneish_components = {
-            'DSRI': DSRI,
-            'GMI': GMI,
-            'AQI': AQI,
-            'SGI': SGI,
-            'DEPI': DEPI,
-            'SGAI': SGAI,
-            'LVGI': LVGI,
-            'TATA': TATA
-        }
-        
-        # Check if all components are available for M-Score
-        missing_components = [k for k, v in beneish_components.items() if pd.isna(v)]
+        # Beneish M-Score requires every component
+        beneish_components = {k: metrics[k] for k in BENEISH_COMPONENTS}
+        missing_components = [k for k, v in beneish_components.items() if v is None]
         if missing_components:
             beneish_m_score = None
             beneish_reason = f"insufficient_fields: {', '.join(missing_components)}"
         else:
-            beneish_m_score = -4.84 + 0.92*DSRI + 0.528*GMI + 0.404*AQI + 0.892*SGI + 0.115*DEPI - 0.172*SGAI + 4.679*TATA - 0.327*LVGI
+            beneish_m_score = metrics['beneish_m']
             beneish_reason = None
         
-        # Altman Z-Score calculation
-        # Z = 1.2A + 1.4B + 3.3C + 0.6D + 1.0E
-        # A = Working Capital / Total Assets
-        # B = Retained Earnings / Total Assets  
-        # C = EBIT / Total Assets
-        # D = Market Value of Equity / Total Liabilities
-        # E = Sales / Total Assets
-        
-        working_capital = TotalCurrentAssets_t - TotalCurrentLiabilities_t
-        retained_earnings = safe_get_field(balance, ['RetainedEarnings'], y_t)
-        ebit = OperatingIncome_t  # EBIT = Operating Income
-        
-        altman_a = safe_div(working_capital, TotalAssets_t)
-        altman_b = safe_div(retained_earnings, TotalAssets_t)
-        altman_c = safe_div(ebit, TotalAssets_t)
-        altman_d = safe_div(TotalStockholderEquity_t, TotalLiabilities_t)  # Using book value as proxy for market value
-        altman_e = safe_div(TotalRevenue_t, TotalAssets_t)
-        
-        # Check if all components are available
-        altman_components = [altman_a, altman_b, altman_c, altman_d, altman_e]
-        if any(pd.isna(comp) for comp in altman_components):
+        # Altman Z-Score requires every component
+        altman_components = {k: metrics[f'altman_{k}'] for k in ALTMAN_COMPONENTS}
+        if None in altman_components.values():
             altman_z_score = None
             altman_reason = "insufficient_fields: missing working capital, retained earnings, EBIT, equity, or revenue data"
         else:
-            altman_z_score = 1.2*altman_a + 1.4*altman_b + 3.3*altman_c + 0.6*altman_d + 1.0*altman_e
+            altman_z_score = metrics['altman_z']
             altman_reason = None
         
         # Calculate alpha using CAPM
-        beta = info.get('beta', 1.0)
-        if beta is None or pd.isna(beta):
-            beta = 1.0
-        alpha = calculate_alpha(ticker, beta)
+        alpha = None
+        if include_alpha:
+            beta = _as_float(info.get('beta'))
+            alpha = calculate_alpha(ticker, 1.0 if beta != beta else beta)
         
         # Validation
         validation = check_accounting_equation(balance)
         
         # Collect missing fields
-        needed_fields = {
-            'income': ['TotalRevenue', 'GrossProfit', 'OperatingIncome', 'NetIncome', 'SellingGeneralAdministrative', 'IncomeTaxExpense', 'InterestExpense'],
-            'balance': ['TotalAssets', 'TotalLiabilities', 'TotalStockholderEquity', 'TotalCurrentAssets', 'TotalCurrentLiabilities', 'Inventory', 'NetPPE', 'RetainedEarnings', 'NetReceivables'],
-            'cashflow': ['TotalCashFromOperatingActivities', 'Depreciation', 'CashDividendsPaid']
-        }
-        
-        missing_fields = collect_missing({'income': income, 'balance': balance, 'cashflow': cashflow}, needed_fields)
+        missing_fields = collect_missing({'income': income, 'balance': balance, 'cashflow': cashflow}, NEEDED_FIELDS)
         if missing_fields:
             notes.extend([f"Missing field: {field}" for field in missing_fields])
         
         # Return deterministic structure with consistent key ordering
-        return {
+        result = {
             "ticker": ticker,
             "currency": currency,
             "years": [str(y) for y in years],
             "validation": validation,
             "ratios": {
-                "current": round(current_ratio, 4) if not pd.isna(current_ratio) else None,
-                "quick": round(quick_ratio, 4) if not pd.isna(quick_ratio) else None,
-                "debt_to_equity": round(debt_to_equity, 4) if not pd.isna(debt_to_equity) else None,
-                "roe": round(roe, 4) if not pd.isna(roe) else None,
-                "roa": round(roa, 4) if not pd.isna(roa) else None,
-                "roe_adjusted": round(roe_adjusted, 4) if not pd.isna(roe_adjusted) else None
+                "current": metrics['current'],
+                "quick": metrics['quick'],
+                "debt_to_equity": metrics['debt_to_equity'],
+                "roe": metrics['roe'],
+                "roa": metrics['roa'],
+                "roe_adjusted": metrics['roe_3step']  # always provided when inputs exist
             },
             "dupont": {
                 "roe_3step": {
-                    "npm": round(npm, 4) if not pd.isna(npm) else None,
-                    "asset_turnover": round(asset_turnover, 4) if not pd.isna(asset_turnover) else None,
-                    "equity_multiplier": round(equity_multiplier, 4) if not pd.isna(equity_multiplier) else None,
-                    "roe": round(roe_dupont_3, 4) if not pd.isna(roe_dupont_3) else None
+                    "npm": metrics['npm'],
+                    "asset_turnover": metrics['asset_turnover'],
+                    "equity_multiplier": metrics['equity_multiplier'],
+                    "roe": metrics['roe_3step']
                 },
                 "roe_5step": {
-                    "tax_burden": round(tax_burden, 4) if not pd.isna(tax_burden) else None,
-                    "interest_burden": round(interest_burden, 4) if not pd.isna(interest_burden) else None,
-                    "operating_margin": round(operating_margin, 4) if not pd.isna(operating_margin) else None,
-                    "asset_turnover": round(asset_turnover, 4) if not pd.isna(asset_turnover) else None,
-                    "equity_multiplier": round(equity_multiplier, 4) if not pd.isna(equity_multiplier) else None,
-                    "roe": round(roe_dupont_5, 4) if not pd.isna(roe_dupont_5) else None
+                    "tax_burden": metrics['tax_burden'],
+                    "interest_burden": metrics['interest_burden'],
+                    "operating_margin": metrics['operating_margin'],
+                    "asset_turnover": metrics['asset_turnover'],
+                    "equity_multiplier": metrics['equity_multiplier'],
+                    "roe": metrics['roe_5step']
                 }
             },
             "piotroski": {
-                "score": round(piotroski_score, 2),
+                "score": piotroski_score,
                 "fscore_display": piotroski_fscore_display,
                 "signals": piotroski_signals
             },
             "beneish": {
-                "m": round(beneish_m_score, 4) if beneish_m_score is not None else None,
+                "m": beneish_m_score,
                 "reason": beneish_reason,
-                "components": {k: round(v, 4) if not pd.isna(v) else None for k, v in beneish_components.items()}
+                "components": beneish_components
             },
             "altman": {
-                "z": round(altman_z_score, 4) if altman_z_score is not None else None,
+                "z": altman_z_score,
                 "z_prime": None,  # Not implemented yet
                 "reason": altman_reason,
-                "components": {
-                    "a": round(altman_a, 4) if not pd.isna(altman_a) else None,
-                    "b": round(altman_b, 4) if not pd.isna(altman_b) else None,
-                    "c": round(altman_c, 4) if not pd.isna(altman_c) else None,
-                    "d": round(altman_d, 4) if not pd.isna(altman_d) else None,
-                    "e": round(altman_e, 4) if not pd.isna(altman_e) else None
-                }
+                "components": altman_components
             },
             "price_based": {
-                "pe": round(pe, 4) if not pd.isna(pe) else None,
-                "pb": round(pb, 4) if not pd.isna(pb) else None,
-                "ps": round(ps, 4) if not pd.isna(ps) else None,
-                "peg": round(peg, 4) if not pd.isna(peg) else None
+                "pe": metrics['pe'],
+                "pb": metrics['pb'],
+                "ps": metrics['ps'],
+                "peg": metrics['peg']
             },
             "dividends": {
-                "dividend_yield": round(dividend_yield, 4) if not pd.isna(dividend_yield) else None,
-                "dividend_payout_ratio": round(dividend_payout_ratio, 4) if not pd.isna(dividend_payout_ratio) else None,
-                "dividend_coverage_ratio": round(dividend_coverage_ratio, 4) if not pd.isna(dividend_coverage_ratio) else None
+                "dividend_yield": metrics['dividend_yield'],
+                "dividend_payout_ratio": metrics['dividend_payout_ratio'],
+                "dividend_coverage_ratio": metrics['dividend_coverage_ratio']
             },
-            "alpha": round(alpha, 4) if alpha is not None and not pd.isna(alpha) else None,
+            "alpha": _rnd(alpha),
             "notes": notes
         }
         
+        if include_profile:
+            result["profile"] = _profile(info)
+        
+        return result
+        
     except Exception as e:
-        return {
-            "ticker": ticker,
-            "error": str(e),
-            "currency": "Unknown",
-            "years": [],
-            "validation": {},
-            "ratios": {},
-            "dupont": {},
-            "piotroski": {"score": None, "fscore_display": "N/A", "signals": {}},
-            "beneish": {"m": None, "reason": f"computation_error: {str(e)}", "components": {}},
-            "altman": {"z": None, "z_prime": None, "reason": f"computation_error: {str(e)}", "components": {}},
-            "price_based": {},
-            "dividends": {},
-            "alpha": None,
-            "notes": [f"Error: {str(e)}"]
-        }
\ No newline at end of file
+        result = _error_result(ticker, str(e))
+        if include_profile:
+            result["profile"] = _error_profile(ticker, raw_data)
+        return result
@@ -2,14 +2,56 @@
 Financial data fetching module using yfinance.
 """
 
+import functools
+import threading
+import time
+import requests
 import yfinance as yf
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from .cache import FILE_CACHE, STATEMENT_TTL, INTRADAY_TTL
+from .normalize import coerce_numeric, two_year_arrays
+
+
+# Neither requests.Session nor yf.Ticker is documented as thread-safe (a Ticker fills its
+# lazily-loaded data on first access without locking), and the FastAPI threadpool and the
+# batch executors call in here concurrently. Each thread therefore gets its own HTTP session,
+# which still reuses its TCP/TLS connections to Yahoo across calls, and its own Ticker cache,
+# so no session or Ticker is ever used by two threads.
+_LOCAL = threading.local()
+
+
+def _session() -> requests.Session:
+    """
+    Return this thread's HTTP session, created on first use.
+    """
+    session = getattr(_LOCAL, "session", None)
+    if session is None:
+        session = _LOCAL.session = requests.Session()
+    return session
+
+
+def _ticker(symbol: str) -> yf.Ticker:
+    """
+    Return this thread's yf.Ticker for symbol, reused for the rest of the UTC day.
+    """
+    ticker_for_day = getattr(_LOCAL, "ticker_for_day", None)
+    if ticker_for_day is None:
+        ticker_for_day = _LOCAL.ticker_for_day = functools.lru_cache(maxsize=256)(_new_ticker)
+    return ticker_for_day(symbol, time.strftime("%Y-%m-%d", time.gmtime()))
+
+
+def _new_ticker(symbol: str, day: str) -> yf.Ticker:
+    # yf.Ticker memoizes what it has downloaded, so the day is part of the cache key; otherwise
+    # a long-running process would keep serving the first info payload past INTRADAY_TTL.
+    return yf.Ticker(symbol, session=_session())
 
 
 def get_financials(ticker: str) -> Dict[str, Any]:
     """
-    Fetch annual financials from yfinance.
+    Fetch annual financials from yfinance, served from the on-disk cache when fresh.
     
     Args:
         ticker: Stock ticker symbol
@@ -17,13 +59,13 @@ def get_financials(ticker: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing income statement, balance sheet, cash flow, and info
     """
-    t = yf.Ticker(ticker)
+    t = _ticker(ticker)
     
     try:
-        income = t.income_stmt
-        balance = t.balance_sheet
-        cashflow = t.cashflow
-        info = t.info
+        income = FILE_CACHE.get_or_fetch(ticker, "income_stmt", STATEMENT_TTL, lambda: t.income_stmt)
+        balance = FILE_CACHE.get_or_fetch(ticker, "balance_sheet", STATEMENT_TTL, lambda: t.balance_sheet)
+        cashflow = FILE_CACHE.get_or_fetch(ticker, "cashflow", STATEMENT_TTL, lambda: t.cashflow)
+        info = FILE_CACHE.get_or_fetch(ticker, "info", INTRADAY_TTL, lambda: t.info)
         
         # Validate that we have data
         if (income is None or (hasattr(income, 'empty') and income.empty)) or \
@@ -41,15 +83,183 @@ def get_financials(ticker: str) -> Dict[str, Any]:
         raise ValueError(f"Failed to fetch data for {ticker}: {str(e)}")
 
 
-def pick_two_years(fin: Dict[str, Any]) -> Dict[str, Any]:
+def get_history(ticker: str, period: str = "3y", interval: str = "1mo") -> pd.DataFrame:
+    """
+    Fetch price history from yfinance, served from the on-disk cache when fresh.
+    
+    Args:
+        ticker: Stock ticker symbol
+        period: yfinance period string (e.g. "3y")
+        interval: yfinance interval string (e.g. "1mo")
+        
+    Returns:
+        History DataFrame (may be empty)
+    """
+    return FILE_CACHE.get_or_fetch(
+        ticker, f"history_{period}_{interval}", INTRADAY_TTL,
+        lambda: _ticker(ticker).history(period=period, interval=interval)
+    )
+
+
+def get_info(ticker: str) -> Dict[str, Any]:
+    """
+    Fetch the yfinance info dictionary, served from the on-disk cache when fresh.
+    
+    Args:
+        ticker: Stock ticker symbol
+        
+    Returns:
+        Info dictionary
+    """
+    return FILE_CACHE.get_or_fetch(ticker, "info", INTRADAY_TTL, lambda: _ticker(ticker).info)
+
+
+def _download_batch(fetch: Callable[[str], Any], tickers: List[str], threads: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run a per-ticker fetch function concurrently; network latency overlaps across threads.
+    
+    Args:
+        fetch: Function taking a ticker and returning its data
+        tickers: Ticker symbols to fetch
+        threads: Worker threads (default: one per ticker, capped at 32)
+        
+    Returns:
+        Dictionary mapping ticker to fetched data, in input order. Tickers whose
+        fetch raised are omitted.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=threads or min(32, len(tickers))) as pool:
+        futures = {pool.submit(fetch, t): t for t in tickers}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                continue
+    
+    return {t: results[t] for t in tickers if t in results}
+
+
+def get_financials_batch(tickers: List[str], threads: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch annual financials for many tickers concurrently.
+    
+    Args:
+        tickers: Stock ticker symbols
+        threads: Worker threads (default: one per ticker, capped at 32)
+        
+    Returns:
+        Dictionary mapping ticker to its get_financials result; failed tickers are omitted
+    """
+    return _download_batch(get_financials, tickers, threads)
+
+
+def download_info(tickers: List[str], threads: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch the info dictionary for many tickers concurrently.
+    
+    Args:
+        tickers: Stock ticker symbols
+        threads: Worker threads (default: one per ticker, capped at 32)
+        
+    Returns:
+        Dictionary mapping ticker to info; failed tickers are omitted
+    """
+    return _download_batch(get_info, tickers, threads)
+
+
+def download_history(tickers: List[str], period: str = "3y", interval: str = "1mo",
+                     threads: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch price history for many tickers concurrently.
+    
+    Args:
+        tickers: Stock ticker symbols
+        period: yfinance period string (e.g. "3y")
+        interval: yfinance interval string (e.g. "1mo")
+        threads: Worker threads (default: one per ticker, capped at 32)
+        
+    Returns:
+        Dictionary mapping ticker to history DataFrame; failed tickers are omitted
+    """
+    return _download_batch(lambda t: get_history(t, period=period, interval=interval), tickers, threads)
+
+
+# Symbols per yf.download request; Yahoo serves up to 20 in one quote/chart call
+BULK_CHUNK = 20
+
+
+def download_history_bulk(tickers: List[str], period: str = "3y", interval: str = "1mo",
+                          chunk_size: int = BULK_CHUNK) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch price history for many tickers with one yf.download request per chunk of symbols.
+    
+    Histories already in the on-disk cache are not requested again, and freshly downloaded
+    ones are cached under the same key get_history uses.
+    
+    Args:
+        tickers: Stock ticker symbols
+        period: yfinance period string (e.g. "3y")
+        interval: yfinance interval string (e.g. "1mo")
+        chunk_size: Symbols per request
+        
+    Returns:
+        Dictionary mapping ticker to history DataFrame, in input order; tickers without data are omitted
+    """
+    tickers = list(dict.fromkeys(tickers))
+    endpoint = f"history_{period}_{interval}"
+    
+    results = {}
+    misses = []
+    for t in tickers:
+        cached = FILE_CACHE.get(t, endpoint, INTRADAY_TTL)
+        if cached is None:
+            misses.append(t)
+        else:
+            results[t] = cached
+    
+    for start in range(0, len(misses), chunk_size):
+        chunk = misses[start:start + chunk_size]
+        try:
+            # auto_adjust and ignore_tz=False match Ticker.history, so bulk and single fetches
+            # agree on Close and on the tz-aware index they are cached and joined with
+            df = yf.download(" ".join(chunk), period=period, interval=interval, group_by="ticker",
+                             auto_adjust=True, ignore_tz=False, progress=False, session=_session())
+        except Exception:
+            continue
+        
+        for t in chunk:
+            if isinstance(df.columns, pd.MultiIndex):
+                if t not in df.columns.get_level_values(0):
+                    continue
+                hist = df[t]
+            else:
+                hist = df  # a single-symbol download has flat columns
+            # Rows are the union of all symbols' dates; drop the ones this symbol has no data for
+            hist = hist.dropna(how="all")
+            if hist.empty:
+                continue
+            FILE_CACHE.set(t, endpoint, hist)
+            results[t] = hist
+    
+    return {t: results[t] for t in tickers if t in results}
+
+
+def pick_two_years(fin: Dict[str, Any], fields: Optional[Dict[str, Tuple[str, ...]]] = None) -> Dict[str, Any]:
     """
     Extract the two most recent fiscal years from financial data.
     
     Args:
         fin: Financial data dictionary from get_financials
+        fields: Optional dict mapping statement name ('income', 'balance', 'cashflow') to
+            field names; when given, each statement is also returned as a float64 array
         
     Returns:
-        Dictionary with income, balance, cashflow for two years plus metadata
+        Dictionary with income, balance, cashflow for two years plus metadata, and
+        '<name>_arr' entries (see normalize.two_year_arrays) when fields is given
     """
     # Get the two most recent years (columns are sorted newest first)
     yrs = fin["balance"].columns[:2]
@@ -64,13 +274,18 @@ def pick_two_years(fin: Dict[str, Any]) -> Dict[str, Any]:
     
     currency = fin["info"].get("currency", "N/A")
     
-    return {
+    result = {
         "income": df_income,
         "balance": df_balance,
         "cashflow": df_cash,
         "years": yrs,
         "currency": currency
     }
+    
+    if fields:
+        result.update(two_year_arrays(result, fields, yrs))
+    
+    return result
 
 
 def coerce_numbers(df: pd.DataFrame) -> pd.DataFrame:
@@ -83,7 +298,7 @@ def coerce_numbers(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with numeric values
     """
-    return df.apply(pd.to_numeric, errors="coerce")
+    return coerce_numeric(df)
 
 
 def ensure_units(df: pd.DataFrame) -> pd.DataFrame:
@@ -2,9 +2,114 @@
 Data normalization and preprocessing utilities.
 """
 
+import math
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple, Sequence, Union
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; jitted kernels run as plain Python without it
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        No-op stand-in for numba.njit, usable bare (@njit) or with options (@njit(cache=True)).
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Canonical field names (as produced by normalize_field_names) read by the metric code,
+# in extraction order; tuples so they can be shared as reindex keys without copying
+INCOME_FIELDS = ('TotalRevenue', 'GrossProfit', 'OperatingIncome', 'NetIncome', 'PretaxIncome',
+                 'SellingGeneralAdministrative', 'IncomeTaxExpense', 'InterestExpense')
+BALANCE_FIELDS = ('TotalAssets', 'TotalLiabilities', 'TotalStockholderEquity', 'TotalCurrentAssets',
+                  'TotalCurrentLiabilities', 'Inventory', 'NetPPE', 'RetainedEarnings', 'NetReceivables')
+CASHFLOW_FIELDS = ('TotalCashFromOperatingActivities', 'Depreciation', 'CashDividendsPaid')
+STATEMENT_FIELDS = {'income': INCOME_FIELDS, 'balance': BALANCE_FIELDS, 'cashflow': CASHFLOW_FIELDS}
+
+
+# Raw yfinance/statement labels -> canonical field names; built once at import, read-only
+_FIELD_MAPPINGS = MappingProxyType({
+    # Income Statement
+    'Total Revenue': 'TotalRevenue',
+    'Revenue': 'TotalRevenue',
+    'Operating Revenue': 'TotalRevenue',
+    'Net Sales': 'TotalRevenue',
+    'Sales': 'TotalRevenue',
+    
+    'Cost Of Revenue': 'CostOfRevenue',
+    'Cost of Goods Sold': 'CostOfRevenue',
+    'COGS': 'CostOfRevenue',
+    
+    'Gross Profit': 'GrossProfit',
+    'Gross Income': 'GrossProfit',
+    
+    'Operating Income': 'OperatingIncome',
+    'EBIT': 'OperatingIncome',
+    'Earnings Before Interest And Taxes': 'OperatingIncome',
+    
+    'Net Income': 'NetIncome',
+    'Net Earnings': 'NetIncome',
+    'Net Income Common Stockholders': 'NetIncome',
+    
+    'Pretax Income': 'PretaxIncome',
+    'Income Before Tax': 'PretaxIncome',
+    'Earnings Before Tax': 'PretaxIncome',
+    
+    'Selling General Administrative': 'SellingGeneralAdministrative',
+    'Selling General And Administration': 'SellingGeneralAdministrative',
+    'SG&A': 'SellingGeneralAdministrative',
+    'Selling, General & Administrative': 'SellingGeneralAdministrative',
+    
+    'Income Tax Expense': 'IncomeTaxExpense',
+    'Tax Provision': 'IncomeTaxExpense',
+    'Income Tax': 'IncomeTaxExpense',
+    
+    'Interest Expense': 'InterestExpense',
+    'Interest Paid': 'InterestExpense',
+    
+    # Balance Sheet
+    'Total Assets': 'TotalAssets',
+    'Total Current Assets': 'TotalCurrentAssets',
+    'Current Assets': 'TotalCurrentAssets',
+    
+    'Total Liabilities': 'TotalLiabilities',
+    'Total Liab': 'TotalLiabilities',
+    'Total Liabilities Net Minority Interest': 'TotalLiabilities',
+    'Total Liabilities And Stockholders Equity': 'TotalLiabilities',
+    
+    'Total Current Liabilities': 'TotalCurrentLiabilities',
+    'Current Liabilities': 'TotalCurrentLiabilities',
+    
+    'Total Stockholder Equity': 'TotalStockholderEquity',
+    'Total Equity': 'TotalStockholderEquity',
+    'Stockholders Equity': 'TotalStockholderEquity',
+    
+    'Inventory': 'Inventory',
+    'Net PPE': 'NetPPE',
+    'Property Plant Equipment': 'NetPPE',
+    'Net Property Plant Equipment': 'NetPPE',
+    
+    'Retained Earnings': 'RetainedEarnings',
+    'Net Receivables': 'NetReceivables',
+    'Accounts Receivable': 'NetReceivables',
+    
+    # Cash Flow
+    'Total Cash From Operating Activities': 'TotalCashFromOperatingActivities',
+    'Operating Cash Flow': 'TotalCashFromOperatingActivities',
+    'Cash From Operations': 'TotalCashFromOperatingActivities',
+    
+    'Depreciation': 'Depreciation',
+    'Depreciation And Amortization': 'Depreciation',
+    
+    'Cash Dividends Paid': 'CashDividendsPaid',
+    'Dividends Paid': 'CashDividendsPaid',
+})
 
 
 def normalize_field_names(df: pd.DataFrame) -> pd.DataFrame:
@@ -17,113 +122,66 @@ def normalize_field_names(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with normalized field names
     """
-    # Common field name mappings
-    field_mappings = {
-        # Income Statement
-        'Total Revenue': 'TotalRevenue',
-        'Revenue': 'TotalRevenue',
-        'Operating Revenue': 'TotalRevenue',
-        'Net Sales': 'TotalRevenue',
-        'Sales': 'TotalRevenue',
-        
-        'Cost Of Revenue': 'CostOfRevenue',
-        'Cost of Goods Sold': 'CostOfRevenue',
-        'COGS': 'CostOfRevenue',
-        
-        'Gross Profit': 'GrossProfit',
-        'Gross Income': 'GrossProfit',
-        
-        'Operating Income': 'OperatingIncome',
-        'EBIT': 'OperatingIncome',
-        'Earnings Before Interest And Taxes': 'OperatingIncome',
-        
-        'Net Income': 'NetIncome',
-        'Net Earnings': 'NetIncome',
-        'Net Income Common Stockholders': 'NetIncome',
-        
-        'Pretax Income': 'PretaxIncome',
-        'Income Before Tax': 'PretaxIncome',
-        'Earnings Before Tax': 'PretaxIncome',
-        
-        'Selling General Administrative': 'SellingGeneralAdministrative',
-        'Selling General And Administration': 'SellingGeneralAdministrative',
-        'SG&A': 'SellingGeneralAdministrative',
-        'Selling, General & Administrative': 'SellingGeneralAdministrative',
-        
-        'Income Tax Expense': 'IncomeTaxExpense',
-        'Tax Provision': 'IncomeTaxExpense',
-        'Income Tax': 'IncomeTaxExpense',
-        
-        'Interest Expense': 'InterestExpense',
-        'Interest Paid': 'InterestExpense',
-        
-        # Balance Sheet
-        'Total Assets': 'TotalAssets',
-        'Total Current Assets': 'TotalCurrentAssets',
-        'Current Assets': 'TotalCurrentAssets',
-        
-        'Total Liabilities': 'TotalLiabilities',
-        'Total Liab': 'TotalLiabilities',
-        'Total Liabilities Net Minority Interest': 'TotalLiabilities',
-        'Total Liabilities And Stockholders Equity': 'TotalLiabilities',
-        
-        'Total Current Liabilities': 'TotalCurrentLiabilities',
-        'Current Liabilities': 'TotalCurrentLiabilities',
-        
-        'Total Stockholder Equity': 'TotalStockholderEquity',
-        'Total Equity': 'TotalStockholderEquity',
-        'Stockholders Equity': 'TotalStockholderEquity',
-        
-        'Inventory': 'Inventory',
-        'Net PPE': 'NetPPE',
-        'Property Plant Equipment': 'NetPPE',
-        'Net Property Plant Equipment': 'NetPPE',
-        
-        'Retained Earnings': 'RetainedEarnings',
-        'Net Receivables': 'NetReceivables',
-        'Accounts Receivable': 'NetReceivables',
-        
-        # Cash Flow
-        'Total Cash From Operating Activities': 'TotalCashFromOperatingActivities',
-        'Operating Cash Flow': 'TotalCashFromOperatingActivities',
-        'Cash From Operations': 'TotalCashFromOperatingActivities',
-        
-        'Depreciation': 'Depreciation',
-        'Depreciation And Amortization': 'Depreciation',
-        
-        'Cash Dividends Paid': 'CashDividendsPaid',
-        'Dividends Paid': 'CashDividendsPaid',
-    }
-    
-    # Create a copy to avoid modifying original
-    df_normalized = df.copy()
+    # Map every label, then take the first row for each normalized name with a single gather;
+    # the frame is never rebuilt from per-row Series
+    normalized_index = pd.Index([_FIELD_MAPPINGS.get(name, name) for name in df.index], name=df.index.name)
+    keep = ~normalized_index.duplicated(keep='first')
+    if len(set(df.dtypes)) <= 1:
+        # Single dtype (the usual all-float statement): gather rows straight from the 2-D array
+        return pd.DataFrame(df.to_numpy()[keep], index=normalized_index[keep], columns=df.columns)
+    # Mixed dtypes: one block-manager take keeps each column's dtype
+    df_normalized = df.iloc[keep.nonzero()[0]]
+    df_normalized.index = normalized_index[keep]
     
-    # Apply mappings
-    new_index = []
-    new_data = []
-    seen_normalized = set()
+    return df_normalized
+
+
+def two_year_arrays(statements: Dict[str, pd.DataFrame], fields: Dict[str, Tuple[str, ...]], years: List[Any]) -> Dict[str, Any]:
+    """
+    Slice statements into float64 arrays of shape (len(fields), 2) with one bulk reindex each.
     
-    for i, field_name in enumerate(df_normalized.index):
-        normalized_name = field_mappings.get(field_name, field_name)
+    Args:
+        statements: Dict mapping statement name to DataFrame (fields as rows, years as columns)
+        fields: Dict mapping statement name to the field names to extract, in row order
+        years: The two year columns to extract, most recent first
         
-        # Only keep first occurrence of each normalized name
-        if normalized_name not in seen_normalized:
-            new_index.append(normalized_name)
-            seen_normalized.add(normalized_name)
-            new_data.append(df_normalized.iloc[i])
+    Returns:
+        Dict with '<name>_arr' per statement; rows follow the order of fields[name], missing
+        fields/years are NaN
+    """
+    arrays = {}
+    for name, names in fields.items():
+        arrays[f"{name}_arr"] = statements[name].reindex(index=list(names), columns=list(years)).to_numpy(dtype=np.float64)
+    return arrays
+
+
+def coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert DataFrame values to numeric, coercing errors to NaN.
     
-    # Create new DataFrame with unique normalized names
-    df_normalized = pd.DataFrame(new_data, index=new_index, columns=df_normalized.columns)
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        DataFrame with numeric values (float64 unless the input needed coercing)
+    """
+    # Fast path: yfinance statements are usually numeric already
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        return df.astype(np.float64, copy=False)
     
-    return df_normalized
+    # One coercion pass over the flattened values instead of a to_numeric call per column
+    values = pd.to_numeric(df.to_numpy().ravel(), errors='coerce')
+    return pd.DataFrame(values.reshape(df.shape), index=df.index, columns=df.columns)
 
 
-def select_two_years(financial_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+def select_two_years(financial_data: Dict[str, pd.DataFrame], fields: Dict[str, Tuple[str, ...]] = None) -> Dict[str, Any]:
     """
     Select two most recent fiscal years that exist in all three statements.
     
     Args:
         financial_data: Dict with 'income', 'balance', 'cashflow', 'info' DataFrames
+        fields: Optional dict mapping statement name to canonical field names; when given,
+            the result also carries two_year_arrays() output for those fields
         
     Returns:
         Dict with normalized DataFrames, years, and currency info
@@ -134,17 +192,13 @@ def select_two_years(financial_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
     info = financial_data['info']
     
     # Get common columns (years) across all three statements
-    income_cols = set(income.columns)
-    balance_cols = set(balance.columns)
-    cashflow_cols = set(cashflow.columns)
-    
-    common_years = income_cols.intersection(balance_cols).intersection(cashflow_cols)
+    common_years = income.columns.intersection(balance.columns).intersection(cashflow.columns)
     
     if len(common_years) < 2:
         raise ValueError(f"Insufficient common years: {len(common_years)} found")
     
     # Sort years and take the two most recent
-    sorted_years = sorted(common_years, reverse=True)[:2]
+    sorted_years = common_years.sort_values(ascending=False)[:2].tolist()
     
     # Normalize and coerce to numeric
     income_norm = normalize_field_names(income)
@@ -152,14 +206,14 @@ def select_two_years(financial_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
     cashflow_norm = normalize_field_names(cashflow)
     
     # Coerce to numeric, errors='coerce' converts non-numeric to NaN
-    income_norm = income_norm.apply(pd.to_numeric, errors='coerce')
-    balance_norm = balance_norm.apply(pd.to_numeric, errors='coerce')
-    cashflow_norm = cashflow_norm.apply(pd.to_numeric, errors='coerce')
+    income_norm = coerce_numeric(income_norm)
+    balance_norm = coerce_numeric(balance_norm)
+    cashflow_norm = coerce_numeric(cashflow_norm)
     
     # Extract currency from info
     currency = info.get('currency', 'USD')
     
-    return {
+    result = {
         'income': income_norm,
         'balance': balance_norm,
         'cashflow': cashflow_norm,
@@ -167,41 +221,76 @@ def select_two_years(financial_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
         'years': sorted_years,
         'currency': currency
     }
+    
+    if fields:
+        result.update(two_year_arrays(result, fields, sorted_years))
+    
+    return result
 
 
-def safe_get_field(df: pd.DataFrame, field_names: list, year_idx: Any = None, default: float = np.nan) -> float:
+def safe_get_field(df: pd.DataFrame, field_names: Union[str, Sequence[str]], year_idx: Any = None, default: float = np.nan) -> float:
     """
     Safely get a field value from DataFrame, trying multiple field names.
     
     Args:
         df: Input DataFrame
-        field_names: List of possible field names to try
-        year_idx: Year index to extract value for (if None, returns first non-null value)
-        default: Default value if field not found
+        field_names: Field name, or tuple/list of possible field names to try in order
+        year_idx: Year index to extract value for (if None or not a column, uses the
+            first non-null value in each field's row)
+        default: Default value if no field has a value
         
     Returns:
-        Field value or default
+        First non-null value among field_names, or default
     """
-    for field_name in field_names:
-        if field_name in df.index:
-            value = df.loc[field_name]
-            if isinstance(value, pd.Series):
-                if year_idx is not None and year_idx in value.index:
-                    # Return value for specific year
-                    val = value[year_idx]
-                    if not pd.isna(val):
-                        return float(val)
-                else:
-                    # Return first non-null value from the series
-                    for val in value:
-                        if not pd.isna(val):
-                            return float(val)
-                return default
-            else:
-                # Single value
-                if not pd.isna(value):
-                    return float(value)
-    return default
+    if isinstance(field_names, str):
+        field_names = (field_names,)
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated()]
+    
+    # One batch lookup for all candidate names (-1 where absent), then read rows straight from the array
+    positions = df.index.get_indexer(list(field_names))
+    rows = df.to_numpy()[positions[positions >= 0]]
+    if not rows.size:
+        return default
+    if year_idx is not None and year_idx in df.columns:
+        values = rows[:, df.columns.get_loc(year_idx)]
+    else:
+        # First non-null value in each row (NaN for rows with none)
+        notna = ~pd.isna(rows)
+        values = np.where(notna.any(axis=1), rows[np.arange(len(rows)), notna.argmax(axis=1)], np.nan)
+    if values.dtype.kind not in 'fiub':
+        values = pd.to_numeric(values, errors='coerce')
+    values = values.astype(np.float64)
+    
+    present = np.flatnonzero(~np.isnan(values))
+    return float(values[present[0]]) if present.size else default
+
+
+# Scalar types the jitted helpers accept directly; anything else takes the generic path
+_NUMERIC_SCALARS = (int, float, np.integer, np.floating)
+
+
+@njit(cache=True)
+def _safe_div_nb(numerator, denominator, default):
+    # NaN is the only value unequal to itself; no fastmath, it would fold these checks away
+    if numerator != numerator or denominator != denominator or abs(denominator) < 1e-12:
+        return default
+    result = numerator / denominator
+    if math.isinf(result):
+        return default
+    return result
+
+
+@njit(cache=True)
+def _avg_nb(x, y):
+    if not (math.isfinite(x) and math.isfinite(y)):
+        return np.nan
+    return (x + y) / 2.0
+
+
+@njit(cache=True)
+def _pct_change_nb(current, previous):
+    return _safe_div_nb(current - previous, previous, np.nan)
 
 
 def safe_div(numerator: float, denominator: float, default: float = np.nan) -> float:
@@ -216,6 +305,9 @@ def safe_div(numerator: float, denominator: float, default: float = np.nan) -> f
     Returns:
         Division result or default
     """
+    if (isinstance(numerator, _NUMERIC_SCALARS) and isinstance(denominator, _NUMERIC_SCALARS)
+            and isinstance(default, _NUMERIC_SCALARS)):
+        return _safe_div_nb(float(numerator), float(denominator), float(default))
     try:
         if pd.isna(numerator) or pd.isna(denominator):
             return default
@@ -223,13 +315,95 @@ def safe_div(numerator: float, denominator: float, default: float = np.nan) -> f
             return default
         result = float(numerator / denominator)
         # Check for infinity values
-        if np.isinf(result):
+        if math.isinf(result):
             return default
         return result
     except (ValueError, TypeError, ZeroDivisionError):
         return default
 
 
+def pct_change(current: float, previous: float) -> float:
+    """
+    Fractional change from previous to current, NaN if either is NaN or previous is ~0.
+    
+    Args:
+        current: Current value
+        previous: Previous value
+        
+    Returns:
+        (current - previous) / previous or NaN
+    """
+    if isinstance(current, _NUMERIC_SCALARS) and isinstance(previous, _NUMERIC_SCALARS):
+        return _pct_change_nb(float(current), float(previous))
+    try:
+        return safe_div(current - previous, previous)
+    except TypeError:
+        return np.nan
+
+
+def safe_div_arr(numerator: Any, denominator: Any, default: float = np.nan) -> np.ndarray:
+    """
+    Elementwise safe_div over arrays (or scalars broadcast against them).
+    
+    Args:
+        numerator: Numerator values
+        denominator: Denominator values
+        default: Value used wherever safe_div would return its default
+        
+    Returns:
+        float64 array of quotients, default where an input is NaN, the denominator
+        is ~0, or the quotient is infinite (same rules as safe_div)
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    
+    mask = ~np.isnan(numerator) & ~np.isnan(denominator) & (np.abs(denominator) >= 1e-12)
+    out = np.full(numerator.shape, default, dtype=np.float64)
+    with np.errstate(over='ignore', invalid='ignore'):
+        np.divide(numerator, denominator, out=out, where=mask)
+    out[~np.isfinite(out)] = default
+    return out
+
+
+def avg_arr(x: Any, y: Any) -> np.ndarray:
+    """
+    Elementwise avg over arrays (or scalars broadcast against them).
+    
+    Args:
+        x: First values
+        y: Second values
+        
+    Returns:
+        float64 array of averages, NaN wherever either input is not finite (same rules as avg)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x, y = np.broadcast_arrays(x, y)
+    
+    mask = np.isfinite(x) & np.isfinite(y)
+    out = np.full(x.shape, np.nan, dtype=np.float64)
+    with np.errstate(over='ignore'):
+        np.add(x, y, out=out, where=mask)
+    out[mask] *= 0.5
+    return out
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_SANITIZE_BY_TYPE = {
+    float: lambda value: value if math.isfinite(value) else None,
+    int: _identity,
+    bool: _identity,
+    str: _identity,
+    type(None): _identity,
+    dict: lambda value: {k: sanitize_for_json(v) for k, v in value.items()},
+    list: lambda value: [sanitize_for_json(item) for item in value],
+}
+
+
 def sanitize_for_json(value: Any) -> Any:
     """
     Sanitize values for JSON serialization by converting inf/nan to null.
@@ -240,8 +414,13 @@ def sanitize_for_json(value: Any) -> Any:
     Returns:
         JSON-safe value
     """
+    # Exact-type lookup covers the common leaves and containers; subclasses
+    # (np.float64, OrderedDict, ...) fall through to the isinstance checks
+    handler = _SANITIZE_BY_TYPE.get(type(value))
+    if handler is not None:
+        return handler(value)
     if isinstance(value, (int, float)):
-        if np.isnan(value) or np.isinf(value):
+        if not math.isfinite(value):
             return None
         return value
     elif isinstance(value, dict):
@@ -263,11 +442,13 @@ def avg(x: float, y: float) -> float:
     Returns:
         Average or NaN if either input is NaN
     """
+    if isinstance(x, _NUMERIC_SCALARS) and isinstance(y, _NUMERIC_SCALARS):
+        return _avg_nb(float(x), float(y))
     try:
         if pd.isna(x) or pd.isna(y):
             return np.nan
         x, y = float(x), float(y)
-        if not np.isfinite(x) or not np.isfinite(y):
+        if not (math.isfinite(x) and math.isfinite(y)):
             return np.nan
         return (x + y) / 2.0
     except (ValueError, TypeError):
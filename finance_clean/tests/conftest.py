@@ -0,0 +1,18 @@
+"""
+Shared pytest setup for the finance_clean tests.
+"""
+
+import pathlib
+import sys
+
+import pytest
+
+# Make the repository root importable once for every test module
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+
+@pytest.fixture(scope="session")
+def aapl_result():
+    """compute_all("AAPL"), fetched and computed once per session; tests must not modify it."""
+    from finance_clean.compute import compute_all
+    return compute_all("AAPL")
@@ -0,0 +1,143 @@
+"""
+Tests for the FastAPI layer (conditional GETs and the per-ticker cache).
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+
+from fastapi.testclient import TestClient
+
+import app as api
+
+
+def _fake_compute_all(ticker, include_alpha=False):
+    return {"ticker": ticker, "ratios": {"current": 2.0}, "notes": ["x" * 600]}
+
+
+def _client(monkeypatch):
+    monkeypatch.setattr(api, "compute_all", _fake_compute_all)
+    monkeypatch.setattr(api, "CACHE", OrderedDict())
+    monkeypatch.setattr(api, "INFLIGHT", {})
+    return TestClient(api.app)
+
+
+def test_metrics_etag_not_modified(monkeypatch):
+    """A matching If-None-Match gets 304 with the same weak ETag; anything else gets the body."""
+    client = _client(monkeypatch)
+
+    first = client.get("/metrics/AAPL")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and etag.endswith('"')
+    opaque = etag[2:]
+
+    for header in [etag, opaque, f'"other", {etag}', f'W/"other",{opaque}', "*"]:
+        response = client.get("/metrics/AAPL", headers={"If-None-Match": header})
+        assert response.status_code == 304, header
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    # Only whole tags match: a prefix, a longer tag or an unrelated tag still get the full body
+    for header in ['W/"other"', opaque[:-2] + '"', opaque[:-1] + 'ff"', ""]:
+        response = client.get("/metrics/AAPL", headers={"If-None-Match": header})
+        assert response.status_code == 200, header
+        assert response.json()["ticker"] == "AAPL"
+
+    print("✓ ETag test passed")
+
+
+def _blocking_loader():
+    """Loader that counts calls and blocks its worker thread until released."""
+    calls = []
+    release = threading.Event()
+    
+    def loader(key):
+        calls.append(key)
+        release.wait(5)
+        return {"ticker": key, "n": len(calls)}
+    
+    return loader, calls, release
+
+
+def test_metrics_single_flight_and_force_refresh(monkeypatch):
+    """Concurrent misses share one compute_all call; hits skip it; force_refresh recomputes."""
+    loader, calls, release = _blocking_loader()
+    monkeypatch.setattr(api, "compute_all", lambda ticker, include_alpha=False: loader(ticker))
+    monkeypatch.setattr(api, "CACHE", OrderedDict())
+    monkeypatch.setattr(api, "INFLIGHT", {})
+    
+    async def scenario():
+        waiters = [asyncio.ensure_future(api._cached_metrics("AAPL")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        assert list(api.INFLIGHT) == ["AAPL"]
+        release.set()
+        results = await asyncio.gather(*waiters)
+        assert all(r == {"ticker": "AAPL", "n": 1} for r in results)
+        assert api.INFLIGHT == {}
+        
+        assert await api._cached_metrics("AAPL") == {"ticker": "AAPL", "n": 1}
+        assert await api._cached_metrics("AAPL", force_refresh=True) == {"ticker": "AAPL", "n": 2}
+        assert api.CACHE["AAPL"][1] == {"ticker": "AAPL", "n": 2}
+    
+    asyncio.run(scenario())
+    assert calls == ["AAPL", "AAPL"]
+    
+    print("✓ Single-flight test passed")
+
+
+def test_ttl_cache_cancelled_waiter_keeps_inflight_load():
+    """Cancelling one waiter (a disconnecting client) leaves the shared load running for the others."""
+    loader, calls, release = _blocking_loader()
+    cache, inflight = OrderedDict(), {}
+    
+    async def scenario():
+        leaving = asyncio.ensure_future(api._ttl_cached(cache, inflight, "MSFT", loader))
+        staying = asyncio.ensure_future(api._ttl_cached(cache, inflight, "MSFT", loader))
+        await asyncio.sleep(0.05)
+        task = inflight["MSFT"]
+        
+        leaving.cancel()
+        await asyncio.sleep(0)
+        assert leaving.cancelled()
+        assert inflight.get("MSFT") is task and not task.cancelled()
+        
+        # A request arriving after the cancellation still joins the same load
+        late = asyncio.ensure_future(api._ttl_cached(cache, inflight, "MSFT", loader))
+        await asyncio.sleep(0.05)
+        release.set()
+        assert await staying == {"ticker": "MSFT", "n": 1}
+        assert await late == {"ticker": "MSFT", "n": 1}
+        assert "MSFT" in cache
+    
+    asyncio.run(scenario())
+    assert calls == ["MSFT"]
+    
+    print("✓ Cancelled waiter test passed")
+
+
+def test_ttl_cache_hard_cap(monkeypatch):
+    """Expired entries go first, then the least recently stored, so the cache never exceeds its cap."""
+    monkeypatch.setattr(api, "CACHE_MAX_ENTRIES", 3)
+    cache, inflight = OrderedDict(), {}
+    
+    async def scenario():
+        for key in ["A", "B", "C", "D"]:
+            await api._ttl_cached(cache, inflight, key, lambda k: {"ticker": k})
+        assert list(cache) == ["B", "C", "D"]
+        
+        # Refreshing B moves it to the back; expired entries are dropped even once the cache is under the cap
+        await api._ttl_cached(cache, inflight, "B", lambda k: {"ticker": k}, force_refresh=True)
+        for key in ["C", "D"]:
+            cache[key] = (0.0, cache[key][1])
+        await api._ttl_cached(cache, inflight, "E", lambda k: {"ticker": k})
+        assert list(cache) == ["B", "E"]
+    
+    asyncio.run(scenario())
+    
+    print("✓ Cache cap test passed")
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
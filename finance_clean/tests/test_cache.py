@@ -0,0 +1,67 @@
+"""
+Tests for the on-disk yfinance cache.
+"""
+
+import os
+import pickle
+import tempfile
+import time
+import pandas as pd
+from finance_clean.cache import FileCache
+
+
+def test_cache_roundtrip_and_ttl():
+    """Fresh entries are served from disk; stale entries and empty results are refetched."""
+    cache = FileCache(tempfile.mkdtemp())
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        return pd.DataFrame({"Close": [1.0, 2.0]})
+    
+    first = cache.get_or_fetch("AAPL", "history_3y_1mo", 3600, fetch)
+    second = cache.get_or_fetch("AAPL", "history_3y_1mo", 3600, fetch)
+    assert len(calls) == 1
+    assert second.equals(first)
+    
+    # A negative TTL forces a refetch
+    cache.get_or_fetch("AAPL", "history_3y_1mo", -1, fetch)
+    assert len(calls) == 2
+    
+    # Empty payloads are never cached
+    cache.get_or_fetch("BAD", "info", 3600, dict)
+    assert cache.get("BAD", "info", 3600) is None
+    
+    print("✓ Cache test passed")
+
+
+
+def test_cache_rejects_path_traversal():
+    """Tickers that could leave the cache root are never read from or written to disk."""
+    parent = tempfile.mkdtemp()
+    root = os.path.join(parent, "cache")
+    os.makedirs(root)
+    cache = FileCache(root)
+    
+    # A pickle planted next to the cache root must not be loadable through a ".." ticker
+    with open(os.path.join(parent, "info.pkl"), "wb") as f:
+        pickle.dump({"ts": time.time(), "data": {"planted": True}}, f)
+    
+    for ticker in ["..", ".", "../x", "a/b", "a\\b", "", "AAPL/../.."]:
+        assert cache.get(ticker, "info", 3600) is None, ticker
+        cache.set(ticker, "info", {"x": 1})
+        assert cache.get_or_fetch(ticker, "info", 3600, lambda: {"fresh": True}) == {"fresh": True}
+    assert sorted(os.listdir(parent)) == ["cache", "info.pkl"]
+    assert os.listdir(root) == []
+    
+    # Ordinary symbols, including index and FX tickers, still round-trip
+    for ticker in ["BRK.B", "^GSPC", "EURUSD=X", "brk-b"]:
+        cache.set(ticker, "info", {"symbol": ticker})
+        assert cache.get(ticker, "info", 3600) == {"symbol": ticker}
+    
+    print("✓ Cache path traversal test passed")
+
+
+if __name__ == "__main__":
+    test_cache_roundtrip_and_ttl()
+    test_cache_rejects_path_traversal()
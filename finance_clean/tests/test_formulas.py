@@ -2,13 +2,15 @@
 Comprehensive tests for financial metrics computation.
 """
 
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from finance_clean import compute
 from finance_clean.compute import compute_all, avg, pct_change
-from finance_clean.normalize import safe_div
+from finance_clean.normalize import (safe_div, safe_div_arr, avg_arr, safe_get_field,
+                                     normalize_field_names, sanitize_for_json)
 
 
 def test_synthetic_data():
@@ -99,6 +101,159 @@ def test_formulas():
     print("✓ All formula tests passed")
 
 
+def _statements():
+    """Two years of statements under raw yfinance labels, with round numbers so every metric is checkable by hand."""
+    years = pd.to_datetime(["2023-12-31", "2022-12-31"])
+    
+    def statement(rows):
+        return pd.DataFrame.from_dict(rows, orient="index", columns=years)
+    
+    return {
+        "income": statement({
+            "Total Revenue": [1000, 800], "Gross Profit": [400, 340], "Operating Income": [200, 150],
+            "Net Income": [100, 80], "Pretax Income": [160, 120], "Selling General And Administration": [100, 90],
+            "Tax Provision": [40, 30], "Interest Expense": [10, 10],
+        }),
+        "balance": statement({
+            "Total Assets": [2000, 1800], "Total Liabilities Net Minority Interest": [1000, 1000],
+            "Stockholders Equity": [1000, 800], "Current Assets": [600, 500], "Current Liabilities": [300, 300],
+            "Inventory": [100, 100], "Net PPE": [800, 700], "Retained Earnings": [500, 400],
+            "Accounts Receivable": [150, 100],
+        }),
+        "cashflow": statement({
+            "Operating Cash Flow": [150, 120], "Depreciation And Amortization": [50, 40],
+            "Cash Dividends Paid": [-20, -15],
+        }),
+        "info": {"sharesOutstanding": 100, "currentPrice": 20, "financialCurrency": "USD"},
+    }
+
+
+@pytest.mark.parametrize("kernel", ["jit", "python"])
+def test_compute_all_known_statements(kernel, monkeypatch):
+    """compute_all on fixed statements reproduces hand-computed metrics, jitted or as plain Python."""
+    if kernel == "jit" and not compute.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    if kernel == "python" and compute.NUMBA_AVAILABLE:
+        for name in ("_compute_metrics_kernel", "_kdiv", "_positive"):
+            monkeypatch.setattr(compute, name, getattr(compute, name).py_func)
+    
+    result = compute_all("TEST", raw_data=_statements())
+    
+    assert result["currency"] == "USD"
+    assert len(result["years"]) == 2
+    assert all(year["ok"] for year in result["validation"].values())
+    assert result["notes"] == []
+    
+    # Averages use both years: equity (1000+800)/2, assets (2000+1800)/2
+    assert result["ratios"] == {"current": 2.0, "quick": 1.6667, "debt_to_equity": 1.0,
+                                "roe": 0.1111, "roa": 0.0526, "roe_adjusted": 0.1053}
+    assert result["dupont"]["roe_3step"] == {"npm": 0.1, "asset_turnover": 0.5263,
+                                             "equity_multiplier": 2.0, "roe": 0.1053}
+    assert result["dupont"]["roe_5step"] == {"tax_burden": 0.625, "interest_burden": 0.8,
+                                             "operating_margin": 0.2, "asset_turnover": 0.5263,
+                                             "equity_multiplier": 2.0, "roe": 0.1053}
+    
+    # Every signal passes except F8: gross margin fell from 42.5% to 40%
+    assert result["piotroski"]["score"] == 8
+    assert result["piotroski"]["signals"] == {"F1": 1, "F2": 1, "F3": 1, "F4": 1, "F5": 1,
+                                              "F6": 1, "F7": 1, "F8": 0, "F9": 1}
+    
+    assert result["beneish"]["components"] == {"DSRI": 1.2, "GMI": 1.0625, "AQI": 0.9, "SGI": 1.25,
+                                               "DEPI": 0.9189, "SGAI": 0.8889, "LVGI": 0.9, "TATA": 0.025}
+    assert result["beneish"]["m"] == -1.9209
+    assert result["altman"]["components"] == {"a": 0.15, "b": 0.25, "c": 0.1, "d": 1.0, "e": 0.5}
+    assert result["altman"]["z"] == 1.96
+    
+    # EPS 1.00 (prior 0.80), book and sales per share 10, dividend per share 0.20 from cash paid
+    assert result["price_based"] == {"pe": 20.0, "pb": 2.0, "ps": 2.0, "peg": 0.8}
+    assert result["dividends"] == {"dividend_yield": 0.01, "dividend_payout_ratio": 0.2,
+                                   "dividend_coverage_ratio": 5.0}
+    
+    print("✓ Known statements test passed")
+
+
+def test_compute_all_memoization(monkeypatch):
+    """FINANCE_CLEAN_MEMOIZE=1 reuses successful results (as copies) and never memoizes errors."""
+    calls = []
+    
+    def fake_get_financials(ticker):
+        calls.append(ticker)
+        if ticker == "BAD":
+            raise ValueError("no data")
+        return _statements()
+    
+    monkeypatch.setattr(compute, "get_financials", fake_get_financials)
+    compute._compute_all_memo.cache_clear()
+    
+    monkeypatch.delenv("FINANCE_CLEAN_MEMOIZE", raising=False)
+    compute_all("TEST")
+    compute_all("TEST")
+    assert calls == ["TEST", "TEST"]
+    
+    monkeypatch.setenv("FINANCE_CLEAN_MEMOIZE", "1")
+    first = compute_all("TEST")
+    first["ratios"].clear()
+    assert compute_all("TEST")["ratios"]["current"] == 2.0
+    assert calls == ["TEST", "TEST", "TEST"]
+    
+    assert compute_all("BAD")["error"] == "no data"
+    assert compute_all("BAD")["error"] == "no data"
+    assert calls.count("BAD") == 2
+    compute._compute_all_memo.cache_clear()
+    
+    print("✓ Memoization test passed")
+
+
+def test_compute_all_error_keeps_profile(monkeypatch):
+    """Tickers whose metrics fail (ETFs, new listings) still get the profile from their info payload."""
+    info = {"longName": "SPDR S&P 500 ETF Trust", "sector": None, "beta": 1.0, "regularMarketPrice": 450.5}
+    one_year = _statements()
+    one_year["info"] = info
+    for key in ("income", "balance", "cashflow"):
+        one_year[key] = one_year[key].iloc[:, :1]
+    
+    def fake_get_financials(ticker):
+        if ticker == "SPY":
+            raise ValueError(f"No financial data available for ticker: {ticker}")
+        return one_year
+    
+    monkeypatch.setattr(compute, "get_financials", fake_get_financials)
+    monkeypatch.setattr(compute, "get_info", lambda ticker: info)
+    monkeypatch.delenv("FINANCE_CLEAN_MEMOIZE", raising=False)
+    expected = {"long_name": "SPDR S&P 500 ETF Trust", "sector": None, "industry": None, "beta": 1.0, "price": 450.5}
+    
+    for ticker in ("SPY", "NEW"):
+        result = compute_all(ticker, include_profile=True)
+        assert result["error"]
+        assert result["profile"] == expected
+    assert "profile" not in compute_all("SPY")
+    
+    monkeypatch.setenv("FINANCE_CLEAN_MEMOIZE", "1")
+    compute._compute_all_memo.cache_clear()
+    assert compute_all("SPY", include_profile=True)["profile"] == expected
+    compute._compute_all_memo.cache_clear()
+    
+    print("✓ Error profile test passed")
+
+
+def test_alpha_joins_naive_and_tz_aware_history(monkeypatch):
+    """A tz-naive bulk history still lines up with the tz-aware SPY history by month."""
+    months = pd.date_range("2022-01-01", periods=25, freq="MS")
+    stock = pd.DataFrame({"Close": 100 * 1.01 ** np.arange(25)}, index=months)
+    spy = pd.DataFrame({"Close": 100 * 1.005 ** np.arange(25)}, index=months.tz_localize("America/New_York"))
+    
+    monkeypatch.setattr(compute, "get_history", lambda ticker, period="3y", interval="1mo": spy)
+    compute._spy_monthly_returns.cache_clear()
+    try:
+        alpha = compute._alpha_from_history(stock, 1.0)
+    finally:
+        compute._spy_monthly_returns.cache_clear()
+    
+    assert alpha == pytest.approx((0.01 - 0.005) * 12)
+    
+    print("✓ Alpha timezone alignment test passed")
+
+
 def test_edge_cases():
     """Test edge cases and error handling."""
     
@@ -117,13 +272,82 @@ def test_edge_cases():
     assert pd.isna(avg(10, np.nan))
     assert pd.isna(avg(np.inf, 10))
     
+    # Array averaging follows the scalar rules elementwise
+    xs = [10, np.nan, np.inf, 4]
+    ys = [20, 10, 10, -np.inf]
+    expected = [avg(x, y) for x, y in zip(xs, ys)]
+    np.testing.assert_array_equal(avg_arr(xs, ys), expected)
+    
+    # Array division follows the scalar rules elementwise, including the default
+    nums = [10, 10, np.nan, 3, np.inf, 0, -5, 1]
+    dens = [2, 0, 10, np.inf, 2, 0, 1e-13, -4]
+    for default in (np.nan, 0.0):
+        expected = [safe_div(n, d, default) for n, d in zip(nums, dens)]
+        np.testing.assert_array_equal(safe_div_arr(nums, dens, default), expected)
+    
     print("✓ All edge case tests passed")
 
 
-def test_real_data_structure():
+def test_safe_get_field_aliases():
+    """Aliases are tried in order; an alias with no value falls through to the next one."""
+    df = pd.DataFrame({"2023": [np.nan, 5.0, 7.0], "2022": [np.nan, np.nan, 8.0]},
+                      index=["Revenue", "Sales", "Other"])
+    
+    assert safe_get_field(df, ("Missing", "Revenue", "Sales")) == 5.0
+    assert safe_get_field(df, "Other") == 7.0
+    assert safe_get_field(df, ["Sales", "Other"], "2022") == 8.0
+    assert safe_get_field(df, ("Sales",), "1999") == 5.0  # unknown year: first value in the row
+    assert pd.isna(safe_get_field(df, ("Revenue", "Missing")))
+    assert safe_get_field(df, ("Missing",), default=-1.0) == -1.0
+    
+    # Non-numeric cells count as missing; with a repeated label the first row is used
+    messy = pd.DataFrame({"2023": ["n/a", "12", 3.0]}, index=["Revenue", "Sales", "Revenue"], dtype=object)
+    assert safe_get_field(messy, ("Revenue", "Sales")) == 12.0
+    
+    print("✓ safe_get_field alias test passed")
+
+
+def test_normalize_field_names_keeps_first_alias():
+    """Raw labels map to canonical names, the first row per name wins, and column dtypes survive."""
+    raw = pd.DataFrame({"2023": [1.0, 2.0, 3.0, 4.0], "2022": [5.0, 6.0, 7.0, 8.0]},
+                       index=["Revenue", "Total Revenue", "Custom Line", "EBIT"])
+    
+    single = normalize_field_names(raw)
+    assert list(single.index) == ["TotalRevenue", "Custom Line", "OperatingIncome"]
+    assert single.loc["TotalRevenue"].tolist() == [1.0, 5.0]
+    assert (single.dtypes == np.float64).all()
+    
+    mixed = raw.astype({"2022": object})
+    normalized = normalize_field_names(mixed)
+    assert list(normalized.index) == list(single.index)
+    assert normalized.dtypes.tolist() == [np.dtype(np.float64), np.dtype(object)]
+    assert normalized.loc["OperatingIncome"].tolist() == [4.0, 8.0]
+    
+    print("✓ normalize_field_names test passed")
+
+
+def test_sanitize_for_json():
+    """Non-finite floats become None at any depth; other values, subclasses included, pass through."""
+    value = {
+        "floats": [1.5, float("nan"), float("inf"), -float("inf")],
+        "numpy": [np.float64(2.5), np.float64("nan")],
+        "ordered": OrderedDict(x=float("nan")),
+        "other": [1, True, "s", None, (1, 2)],
+    }
+    assert sanitize_for_json(value) == {
+        "floats": [1.5, None, None, None],
+        "numpy": [2.5, None],
+        "ordered": {"x": None},
+        "other": [1, True, "s", None, (1, 2)],
+    }
+    
+    print("✓ sanitize_for_json test passed")
+
+
+def test_real_data_structure(aapl_result):
     """Test that real data has expected structure."""
     try:
-        result = compute_all("AAPL")
+        result = aapl_result
         
         # Check required keys exist
         required_keys = ["ticker", "currency", "years", "ratios", "dupont", "piotroski", "beneish_components"]
@@ -166,7 +390,7 @@ if __name__ == "__main__":
     test_synthetic_data()
     test_formulas()
     test_edge_cases()
-    test_real_data_structure()
+    test_real_data_structure(compute_all("AAPL"))
     
     print()
     print("🎉 All tests completed successfully!")
\ No newline at end of file
@@ -3,19 +3,17 @@ Smoke tests for finance_clean module.
 """
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from finance_clean.compute import compute_all
 
 
-def test_smoke():
+def test_smoke(aapl_result):
     """Basic smoke test to ensure module works."""
     print("Running smoke test...")
     
     try:
         # Test with Apple
-        result = compute_all("AAPL")
+        result = aapl_result
         
         # Basic structure validation
         assert "ratios" in result, "Missing ratios"
@@ -45,7 +43,7 @@ def test_smoke():
         return False
 
 
-def test_multiple_tickers():
+def test_multiple_tickers(aapl_result):
     """Test with multiple tickers."""
     tickers = ["AAPL", "MSFT", "GOOGL"]
     
@@ -53,7 +51,7 @@ def test_multiple_tickers():
     
     for ticker in tickers:
         try:
-            result = compute_all(ticker)
+            result = aapl_result if ticker == "AAPL" else compute_all(ticker)
             assert result["ticker"] == ticker
             print(f"✓ {ticker} processed successfully")
         except Exception as e:
@@ -65,9 +63,10 @@ def test_multiple_tickers():
 
 
 if __name__ == "__main__":
+    aapl = compute_all("AAPL")
     success = True
-    success &= test_smoke()
-    success &= test_multiple_tickers()
+    success &= test_smoke(aapl)
+    success &= test_multiple_tickers(aapl)
     
     if success:
         print("\n🎉 All tests passed!")
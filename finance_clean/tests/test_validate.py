@@ -0,0 +1,81 @@
+"""
+Tests for the statement validation helpers.
+"""
+
+import numpy as np
+import pandas as pd
+from finance_clean.validate import check_accounting_equation, collect_missing
+
+EQUATION_ROWS = ["TotalAssets", "TotalLiabilities", "TotalStockholderEquity"]
+
+
+def test_accounting_equation_balanced_and_off():
+    """Years within tolerance pass; a 10% gap fails with the delta reported."""
+    balance = pd.DataFrame({"2023": [100.0, 60.0, 40.0], "2022": [100.0, 70.0, 40.0]}, index=EQUATION_ROWS)
+
+    result = check_accounting_equation(balance)
+    assert result["2023"] == {"ok": True, "delta": 0.0, "assets": 100.0, "liabilities": 60.0,
+                              "equity": 40.0, "calculated_total": 100.0}
+    assert result["2022"]["ok"] is False
+    assert abs(result["2022"]["delta"] - 0.1) < 1e-12
+
+    print("✓ Accounting equation test passed")
+
+
+def test_accounting_equation_missing_and_zero_assets():
+    """Zero or NaN assets are an error entry; a NaN component fails without raising."""
+    balance = pd.DataFrame({"2023": [0.0, 1.0, 1.0], "2022": [np.nan, 1.0, 2.0], "2021": [100.0, np.nan, 40.0]},
+                           index=EQUATION_ROWS)
+
+    result = check_accounting_equation(balance)
+    for year in ("2023", "2022"):
+        assert result[year] == {"ok": False, "delta": float("inf"), "error": "Total Assets is zero or missing"}
+    assert result["2021"]["ok"] is False
+    assert np.isnan(result["2021"]["delta"])
+
+    print("✓ Missing/zero assets test passed")
+
+
+def test_accounting_equation_non_numeric_cells():
+    """A non-numeric cell turns only its own year into an error entry."""
+    balance = pd.DataFrame({"2023": [100, 60, 40], "2022": ["abc", 1, 2], "2021": [100, "n/a", 40]},
+                           index=EQUATION_ROWS, dtype=object)
+
+    result = check_accounting_equation(balance)
+    assert result["2023"]["ok"] is True
+    assert result["2022"] == {"ok": False, "delta": float("inf"),
+                              "error": "could not convert string to float: 'abc'"}
+    assert result["2021"] == {"ok": False, "delta": float("inf"),
+                              "error": "could not convert string to float: 'n/a'"}
+
+    print("✓ Non-numeric cell test passed")
+
+
+def test_accounting_equation_duplicate_labels():
+    """With a repeated row label the first row is used."""
+    balance = pd.DataFrame({"2023": [100.0, 60.0, 40.0, 5.0]}, index=EQUATION_ROWS + ["TotalAssets"])
+
+    result = check_accounting_equation(balance)
+    assert result["2023"]["ok"] is True
+    assert result["2023"]["assets"] == 100.0
+
+    print("✓ Duplicate label test passed")
+
+
+def test_collect_missing():
+    """Absent rows and rows with no value in any year are missing; order follows the request."""
+    income = pd.DataFrame({"2023": [1.0, np.nan, np.nan], "2022": [2.0, 3.0, np.nan]},
+                          index=["TotalRevenue", "NetIncome", "GrossProfit"])
+    needed = {"income": ("GrossProfit", "TotalRevenue", "SGA", "NetIncome"), "cashflow": ("Depreciation",)}
+
+    assert collect_missing({"income": income}, needed) == ["income:GrossProfit", "income:SGA", "cashflow:Depreciation"]
+
+    print("✓ collect_missing test passed")
+
+
+if __name__ == "__main__":
+    test_accounting_equation_balanced_and_off()
+    test_accounting_equation_missing_and_zero_assets()
+    test_accounting_equation_non_numeric_cells()
+    test_accounting_equation_duplicate_labels()
+    test_collect_missing()
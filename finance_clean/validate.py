@@ -4,7 +4,12 @@ Financial data validation utilities.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
+from .normalize import coerce_numeric, safe_div_arr, safe_get_field  # safe_get_field re-exported for callers that imported it from here
+
+
+# Balance sheet rows read by check_accounting_equation, in array row order
+_EQUATION_FIELDS = ('TotalAssets', 'TotalLiabilities', 'TotalStockholderEquity')
 
 
 def check_accounting_equation(balance_df: pd.DataFrame, tol: float = 0.01) -> Dict[str, Any]:
@@ -20,45 +25,69 @@ def check_accounting_equation(balance_df: pd.DataFrame, tol: float = 0.01) -> Di
     """
     results = {}
     
-    for col in balance_df.columns:
-        try:
-            # Get the three key components
-            ta = safe_get_field(balance_df, ['TotalAssets'], col)
-            tl = safe_get_field(balance_df, ['TotalLiabilities'], col)
-            te = safe_get_field(balance_df, ['TotalStockholderEquity'], col)
-            
-            # Calculate difference as percentage of total assets
-            if ta > 0:
-                diff = abs(ta - (tl + te)) / ta
-                results[str(col)] = {
-                    "ok": diff <= tol,
-                    "delta": diff,
-                    "assets": ta,
-                    "liabilities": tl,
-                    "equity": te,
-                    "calculated_total": tl + te
-                }
-            else:
-                results[str(col)] = {
-                    "ok": False,
-                    "delta": float('inf'),
-                    "error": "Total Assets is zero or missing"
-                }
-                
-        except Exception as e:
+    # One reindex pulls the three components for every year into a (3, n_years) array;
+    # the per-year loop below then works on plain floats instead of pandas lookups
+    if balance_df.index.has_duplicates:
+        balance_df = balance_df[~balance_df.index.duplicated()]
+    components = balance_df.reindex(index=_EQUATION_FIELDS)
+    values = coerce_numeric(components).to_numpy(dtype=np.float64)
+    # Non-numeric cells come back as NaN; remember them so those years report the conversion error
+    unparsable = np.isnan(values) & components.notna().to_numpy()
+    
+    # Difference as a fraction of total assets and the pass/fail test, for every year at once
+    assets, liabilities, equity = values
+    deltas = safe_div_arr(np.abs(assets - (liabilities + equity)), assets)
+    has_assets = assets > 0
+    ok = has_assets & (deltas <= tol)
+    
+    for j, (col, (ta, tl, te), diff, year_ok, year_has_assets) in enumerate(zip(
+            balance_df.columns, values.T.tolist(), deltas.tolist(), ok.tolist(), has_assets.tolist())):
+        error = _conversion_error(components.iloc[:, j]) if unparsable[:, j].any() else None
+        if error is not None:
+            results[str(col)] = {
+                "ok": False,
+                "delta": float('inf'),
+                "error": error
+            }
+        elif year_has_assets:
+            results[str(col)] = {
+                "ok": year_ok,
+                "delta": diff,
+                "assets": ta,
+                "liabilities": tl,
+                "equity": te,
+                "calculated_total": tl + te
+            }
+        else:
             results[str(col)] = {
                 "ok": False,
                 "delta": float('inf'),
-                "error": str(e)
+                "error": "Total Assets is zero or missing"
             }
     
     return results
 
 
-def collect_missing(df_map: Dict[str, pd.DataFrame], needed: Dict[str, List[str]]) -> List[str]:
+def _conversion_error(cells: pd.Series) -> Optional[str]:
+    """
+    Message float() raises for the first cell that cannot be read as a number, or None.
+    """
+    for cell in cells:
+        if pd.isna(cell):
+            continue
+        try:
+            float(cell)
+        except (TypeError, ValueError) as e:
+            return str(e)
+    return None
+
+
+def collect_missing(df_map: Dict[str, pd.DataFrame], needed: Dict[str, Sequence[str]]) -> List[str]:
     """
     Collect missing fields from DataFrames.
     
+    A field counts as missing when its row is absent or holds no value in any year.
+    
     Args:
         df_map: Dictionary mapping section names to DataFrames
         needed: Dictionary mapping section names to required field lists
@@ -72,45 +101,9 @@ def collect_missing(df_map: Dict[str, pd.DataFrame], needed: Dict[str, List[str]
         if section not in df_map:
             missing.extend([f"{section}:{field}" for field in fields])
             continue
-            
-        df = df_map[section]
-        for field in fields:
-            if field not in df.index:
-                missing.append(f"{section}:{field}")
+        
+        # Rows with at least one value, then a single set difference in field order
+        present = df_map[section].dropna(how='all').index
+        missing.extend([f"{section}:{field}" for field in pd.Index(fields).difference(present, sort=False)])
     
     return missing
-
-
-def safe_get_field(df: pd.DataFrame, field_names: List[str], year_idx: Any = None, default: float = np.nan) -> float:
-    """
-    Safely get a field value from DataFrame, trying multiple field names.
-    
-    Args:
-        df: Input DataFrame
-        field_names: List of possible field names to try
-        year_idx: Year index to extract value for (if None, returns first non-null value)
-        default: Default value if field not found
-        
-    Returns:
-        Field value or default
-    """
-    for field_name in field_names:
-        if field_name in df.index:
-            value = df.loc[field_name]
-            if isinstance(value, pd.Series):
-                if year_idx is not None and year_idx in value.index:
-                    # Return value for specific year
-                    val = value[year_idx]
-                    if not pd.isna(val):
-                        return float(val)
-                else:
-                    # Return first non-null value from the series
-                    for val in value:
-                        if not pd.isna(val):
-                            return float(val)
-                return default
-            else:
-                # Single value
-                if not pd.isna(value):
-                    return float(value)
-    return default
\ No newline at end of file